@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# bench_parse.py — lines/sec of the compiled line classifier vs. the original check chain
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+import parse_instructors as pi
+
+
+def legacy_iter_lines(lines, counts, by_college, sections, start=1):
+    # the pre-classifier code path: strip, anchor test, header lookup,
+    # filler set, ';' search, then parse_name / split_right for every row
+    current_college = None
+    for lineno, raw in enumerate(lines, start=start):
+        counts["total_lines"] += 1
+        s = raw.rstrip("\n").strip()
+        if not s:
+            counts["blank_lines"] += 1
+            continue
+        if s.startswith(pi.copyright_anchor) and "Western Governors University" in s:
+            counts["footer_lines"] += 1
+            continue
+        if s in pi.catalog_headers:
+            if s == "Instructor Directory":
+                counts["title_lines"] += 1
+            else:
+                counts["college_header_lines"] += 1
+                current_college = s
+                sections.append(s)
+            continue
+        if set(s) == {"."}:
+            counts["other_lines"] += 1
+            continue
+        if ";" not in s:
+            counts["other_lines"] += 1
+            continue
+        name_part, right = s.split(";", 1)
+        last, firsts, _ = pi.parse_name(name_part, lineno)
+        degree, university, _ = pi.split_right(right, lineno)
+        if not current_college:
+            current_college = "Unknown"
+        counts["instructor_lines"] += 1
+        by_college[current_college] += 1
+        yield {
+            "college": current_college,
+            "last_name": last,
+            "first_names": firsts,
+            "degree": degree,
+            "university": university,
+            "lineno": lineno,
+        }
+
+
+def run(fn, lines):
+    counts, by_college, sections = pi.new_counts(), Counter(), []
+    records = list(fn(lines, counts, by_college, sections))
+    return counts, by_college, sections, records
+
+
+def lines_per_sec(fn, lines, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        counts, by_college, sections = pi.new_counts(), Counter(), []
+        t0 = time.perf_counter()
+        for _ in fn(lines, counts, by_college, sections):
+            pass
+        best = min(best, time.perf_counter() - t0)
+    return len(lines) / best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare line-classifier throughput.")
+    ap.add_argument("input", nargs="?", default=str(pi.infile))
+    ap.add_argument("--scale", type=int, default=50, help="repeat the dump N times in memory")
+    ap.add_argument("--repeat", type=int, default=5, help="timing runs; best is reported")
+    args = ap.parse_args(argv)
+
+    pi.DEBUG = False  # time parsing, not terminal I/O
+    with open(args.input, encoding="utf-8") as f:
+        lines = f.readlines() * args.scale
+
+    same = run(legacy_iter_lines, lines) == run(pi.iter_lines, lines)
+    legacy = lines_per_sec(legacy_iter_lines, lines, args.repeat)
+    compiled = lines_per_sec(pi.iter_lines, lines, args.repeat)
+
+    print(f"input: {args.input} x{args.scale} = {len(lines):,} lines")
+    print(f"outputs match: {'yes' if same else 'NO'}")
+    print(f"check chain:         {legacy:>12,.0f} lines/s")
+    print(f"compiled classifier: {compiled:>12,.0f} lines/s  ({compiled / legacy:.2f}x)")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# bench_suite.py — lines/sec and peak memory per pipeline stage on synthetic dumps
+#
+# For each size, synth_directory.py writes a messy dump, a clean dump (for
+# base_parser.py, which assumes well-formed rows) and the matching
+# instructors CSV. Every stage then runs in its own subprocess so peak RSS
+# is measured per stage. Results can be saved and compared against a
+# previous run to catch regressions. clean_inputs counts CSV rows as lines.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import synth_directory
+
+HERE = Path(__file__).resolve().parent
+STAGES = ["base_parser", "parse_text", "parse_parallel", "clean_inputs"]
+DEFAULT_SIZES = "1159,100000,1000000"
+
+
+def _peak_mb():
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, kids) / 1024  # ru_maxrss is KiB on Linux
+
+
+def run_stage(stage, workdir):
+    """Run one stage in this process and return (seconds, units processed)."""
+    workdir = Path(workdir)
+    sys.path.insert(0, str(HERE))
+
+    if stage == "base_parser":
+        # module-level script: reads instructor_data_raw.txt from the cwd
+        os.chdir(workdir / "clean")
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(str(HERE / "base_parser.py"))
+        return time.perf_counter() - t0, _count_lines(workdir / "clean" / "instructor_data_raw.txt")
+
+    dump = workdir / "messy.txt"
+    if stage.startswith("parse_"):
+        import parse_instructors as pi
+        pi.DEBUG = False
+        t0 = time.perf_counter()
+        counts = pi.new_counts()
+        if stage == "parse_text":
+            for _ in pi.iter_records(dump, counts):
+                pass
+        else:
+            for _, c, *_ in pi.parse_snapshots([dump], jobs=os.cpu_count()):
+                counts.update(c)
+        return time.perf_counter() - t0, counts["total_lines"]
+
+    if stage == "clean_inputs":
+        import normalize_degrees as nd
+        df = nd.load_input(workdir / "instructors.csv")
+        t0 = time.perf_counter()
+        nd.clean_inputs(df)
+        return time.perf_counter() - t0, len(df)
+
+    raise SystemExit(f"unknown stage: {stage}")
+
+
+def _count_lines(path):
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def prepare(workdir, n_lines, seed):
+    (workdir / "clean").mkdir(parents=True, exist_ok=True)
+    vocab = synth_directory.load_vocab()
+    synth_directory.generate(workdir / "messy.txt", n_lines, seed, messy=True,
+                             csv_path=workdir / "instructors.csv", vocab=vocab)
+    synth_directory.generate(workdir / "clean" / "instructor_data_raw.txt", n_lines, seed,
+                             messy=False, vocab=vocab)
+
+
+def measure(stage, workdir):
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--run-stage", stage, str(workdir)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"stage": stage, "error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f:
+        base = {(r["lines"], r["stage"]): r for r in json.load(f) if "error" not in r}
+    regressions = []
+    for r in results:
+        b = base.get((r["lines"], r["stage"]))
+        if b and "error" not in r and r["lines_per_sec"] < b["lines_per_sec"] * (1 - tolerance):
+            regressions.append((r, b))
+    for r, b in regressions:
+        print(f"REGRESSION {r['stage']} @ {r['lines']:,} lines: "
+              f"{r['lines_per_sec']:,.0f} vs {b['lines_per_sec']:,.0f} lines/s")
+    return not regressions
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--run-stage"]:
+        seconds, units = run_stage(argv[1], argv[2])
+        print(json.dumps({"stage": argv[1], "seconds": seconds, "units": units,
+                          "peak_mb": _peak_mb()}))
+        return 0
+
+    ap = argparse.ArgumentParser(description="Benchmark the atlas parsing stages.")
+    ap.add_argument("--lines", default=DEFAULT_SIZES,
+                    help=f"comma-separated dump sizes in lines (default {DEFAULT_SIZES}; up to 10M)")
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", default=None, help="keep generated files here")
+    ap.add_argument("--save", default=None, help="write results as JSON")
+    ap.add_argument("--compare", default=None, help="previous --save output to check against")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="allowed lines/sec drop vs --compare (default 0.2 = 20%%)")
+    args = ap.parse_args(argv)
+
+    sizes = [int(x) for x in args.lines.split(",")]
+    stages = args.stages.split(",")
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.workdir or tmp)
+        print(f"{'lines':>12}  {'stage':<15} {'lines/s':>12} {'peak MB':>9} {'seconds':>9}")
+        for n in sizes:
+            workdir = root / f"n{n}"
+            prepare(workdir, n, args.seed)
+            for stage in stages:
+                r = measure(stage, workdir)
+                r["lines"] = n
+                results.append(r)
+                if "error" in r:
+                    print(f"{n:>12,}  {stage:<15} error: {r['error']}")
+                    continue
+                r["lines_per_sec"] = r["units"] / r["seconds"] if r["seconds"] else 0.0
+                print(f"{n:>12,}  {stage:<15} {r['lines_per_sec']:>12,.0f} "
+                      f"{r['peak_mb']:>9.1f} {r['seconds']:>9.2f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# degree_normalizer.py — one place that knows degree titles
+#
+# Built once from degree_normalization_map.json (raw title -> standard
+# title) into a character trie that ignores periods, so "M.Ed." and "MEd"
+# are the same key. parse_instructors.py uses it to find a degree at the
+# start of a comma-less "Degree University" cell; normalize_degrees.py
+# uses it to get the standard title and level of every degree it sees.
+
+import json
+import sys
+from pathlib import Path
+
+MAP_FILE = Path(__file__).with_name("degree_normalization_map.json")
+
+LEVELS = ["doctorate", "master", "bachelor", "associate"]
+
+# standard titles (upper-cased) per level; anything else is "unknown"
+LEVEL_TITLES = {
+    "doctorate": {"PHD", "EDD", "DBA", "DNP", "JD", "MD"},
+    "master": {"MASTER", "MA", "MS", "MBA", "MED", "MPA", "MPH", "MSN", "MLIS", "MSIT", "MSCS"},
+    "bachelor": {"BACHELOR", "BA", "BS", "BSN"},
+    "associate": {"ASSOCIATE", "AA", "AS"},
+}
+
+_END = ""  # trie key holding the standard title of a complete entry
+
+# regression cases for match_prefix(): text -> the degree it starts with
+PREFIX_CASES = {
+    "MS University of Utah": "MS",
+    "M.Ed. Western Governors University": "M.Ed.",
+    "M.S.University": "M.S.",
+    "M.Ed.WGU": "M.Ed.",
+    "MSU Denver": "",
+    "MBAUniversity": "",
+    "Master of Science": "",
+}
+
+
+def _is_word(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class DegreeNormalizer:
+    """
+    Dot-insensitive trie over raw degree titles.
+
+    normalize() answers whole titles (memoized); match_prefix() finds the
+    longest title at the start of a string that ends on a word boundary.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        self.level_by_title = {t: lvl for lvl, titles in LEVEL_TITLES.items() for t in titles}
+        self.root = {}
+        for raw, standard in self.mapping.items():
+            node = self.root
+            for ch in raw:
+                if ch != ".":
+                    node = node.setdefault(ch, {})
+            node[_END] = standard
+        self._cache = {}
+
+    @classmethod
+    def from_json(cls, path=MAP_FILE):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def standard(self, title):
+        """Standard title for an exact (dot-insensitive) match, else None."""
+        node = self.root
+        for ch in title:
+            if ch == ".":
+                continue
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def level(self, standard):
+        if not standard:
+            return "unknown"
+        return self.level_by_title.get(standard.upper(), "unknown")
+
+    def normalize(self, title):
+        """
+        Return (standard, level) for a raw degree title.
+
+        Unknown titles keep their own text as the standard, and their level
+        is still looked up from it; None gives (None, "unknown").
+        """
+        try:
+            return self._cache[title]
+        except KeyError:
+            pass
+        if title is None:
+            result = (None, "unknown")
+        else:
+            standard = self.standard(title) or title
+            result = (standard, self.level(standard))
+        self._cache[title] = result
+        return result
+
+    def match_prefix(self, text):
+        """
+        Length of the longest degree title at the start of text, or 0.
+
+        The match has to end at a word boundary or on trailing periods after
+        the last letter, which are part of it ("M.Ed. WGU", "M.S.University").
+        """
+        node = self.root
+        best = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            if ch == "." and node is self.root:
+                break
+            if ch != ".":
+                node = node.get(ch)
+                if node is None:
+                    break
+            if _END in node and ch != ".":
+                j = i + 1
+                while j < n and text[j] == ".":
+                    j += 1
+                if j == n or j > i + 1 or not _is_word(text[j]):
+                    best = j
+        return best
+
+
+NORMALIZER = DegreeNormalizer.from_json()
+
+
+def check():
+    """Run PREFIX_CASES; returns the failures."""
+    bad = [(t, want) for t, want in PREFIX_CASES.items() if t[:NORMALIZER.match_prefix(t)] != want]
+    for t, want in bad:
+        print(f"wrong: {t!r} should start with {want!r}")
+    return bad
+
+
+def main(argv=None):
+    # look up titles from the command line: standard and level for each
+    argv = sys.argv[1:] if argv is None else argv
+    if argv == ["--check"]:
+        return 1 if check() else 0
+    for title in argv:
+        standard, level = NORMALIZER.normalize(title)
+        print(f"{title} -> {standard} ({level})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
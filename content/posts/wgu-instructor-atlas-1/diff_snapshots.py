@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# diff_snapshots.py — what changed between two monthly instructor snapshots
+#
+# Snapshots can be raw dumps (instructor_data_raw.txt style, parsed with
+# parse_instructors.iter_records) or parsed CSVs (2025_06_instructors.csv
+# style). Rows are keyed by a stable hash of the instructor's name, so a
+# degree, university or college edit shows up as a change, not as a
+# remove + add. Namesakes in the new snapshot take over the keys of the
+# old namesakes they most resemble (same college first, then most equal
+# fields), so editing one of two John Smiths changes that one only.
+# delta_instructors.csv holds only new and changed rows in
+# the instructors CSV schema, ready to feed the downstream stages.
+
+import argparse
+import csv
+import hashlib
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import parse_instructors
+
+TRACKED_FIELDS = ("college", "degree", "university")
+CSV_FIELDS = ["first_name", "last_name", "college", "degree", "degree_level", "university"]
+
+
+def _hash(*parts):
+    return hashlib.blake2b("\x1f".join(p or "" for p in parts).encode("utf-8"),
+                           digest_size=8).hexdigest()
+
+
+def read_snapshot(path):
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield {
+                    "college": row.get("college") or None,
+                    "last_name": row.get("last_name") or None,
+                    "first_names": row.get("first_name") or None,
+                    "degree": row.get("degree") or None,
+                    "degree_level": row.get("degree_level") or None,
+                    "university": row.get("university") or None,
+                }
+    else:
+        yield from parse_instructors.iter_records(path)
+
+
+def keyed(records, previous=None):
+    """
+    Map stable row key -> record.
+
+    The key hashes the case-folded name. Namesakes within one snapshot get
+    an ordinal suffix, assigned in content-hash order so the pairing does
+    not depend on where the rows sit in the file. With previous (the keyed
+    older snapshot), namesakes first reuse the keys of the old records they
+    resemble most; only the rest get new ordinals.
+    """
+    by_name = defaultdict(list)
+    for rec in records:
+        name_key = _hash((rec["last_name"] or "").casefold(),
+                         (rec["first_names"] or "").casefold())
+        by_name[name_key].append(rec)
+
+    old_keys = defaultdict(list)
+    for k in previous or ():
+        old_keys[k.partition("#")[0]].append(k)
+
+    out = {}
+    for name_key, recs in by_name.items():
+        recs.sort(key=content_hash)
+        olds = sorted(old_keys[name_key], key=lambda k: content_hash(previous[k]))
+        paired = _pair([previous[k] for k in olds], recs)
+        for j, a in paired.items():
+            out[olds[a]] = recs[j]
+        i = 0
+        for j, rec in enumerate(recs):
+            if j in paired:
+                continue
+            while (k := name_key if i == 0 else f"{name_key}#{i + 1}") in out or k in olds:
+                i += 1
+            out[k] = rec
+    return out
+
+
+def _pair(olds, news):
+    """
+    Greedy pairing of namesakes, most similar first: {new index: old index}.
+    Both lists are in content-hash order, so that order breaks ties.
+    """
+    scored = sorted(((a, b) for a in range(len(olds)) for b in range(len(news))),
+                    key=lambda ab: similarity(olds[ab[0]], news[ab[1]]), reverse=True)
+    paired, used = {}, set()
+    for a, b in scored:
+        if a not in used and b not in paired:
+            paired[b] = a
+            used.add(a)
+    return paired
+
+
+def similarity(a, b):
+    """How alike two namesakes are: same college first, then the number of equal fields."""
+    return a.get("college") == b.get("college"), sum(a.get(f) == b.get(f) for f in TRACKED_FIELDS)
+
+
+def content_hash(rec):
+    return _hash(*(rec.get(f) for f in TRACKED_FIELDS))
+
+
+def diff(old, new):
+    """Return (added, removed, changed) between two keyed snapshots."""
+    added = [k for k in new if k not in old]
+    removed = [k for k in old if k not in new]
+    changed = []
+    for k in new.keys() & old.keys():
+        if content_hash(new[k]) != content_hash(old[k]):
+            fields = [f for f in TRACKED_FIELDS if new[k].get(f) != old[k].get(f)]
+            changed.append((k, fields))
+    changed.sort()
+    return sorted(added), sorted(removed), changed
+
+
+def _csv_row(rec):
+    return {
+        "first_name": rec["first_names"] or "",
+        "last_name": rec["last_name"] or "",
+        "college": rec["college"] or "",
+        "degree": rec["degree"] or "",
+        "degree_level": rec.get("degree_level") or "",
+        "university": rec["university"] or "",
+    }
+
+
+def write_delta(out_dir, old, new, added, removed, changed):
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with (out_dir / "added.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["key"] + CSV_FIELDS)
+        w.writeheader()
+        for k in added:
+            w.writerow({"key": k, **_csv_row(new[k])})
+
+    with (out_dir / "removed.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["key"] + CSV_FIELDS)
+        w.writeheader()
+        for k in removed:
+            w.writerow({"key": k, **_csv_row(old[k])})
+
+    with (out_dir / "changed.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["key", "first_name", "last_name", "field", "old", "new"])
+        for k, fields in changed:
+            for field in fields:
+                w.writerow([k, new[k]["first_names"] or "", new[k]["last_name"] or "",
+                            field, old[k].get(field) or "", new[k].get(field) or ""])
+
+    # only what downstream stages need to (re)process this month
+    with (out_dir / "delta_instructors.csv").open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        w.writeheader()
+        for k in sorted(added + [k for k, _ in changed]):
+            w.writerow(_csv_row(new[k]))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Diff two instructor directory snapshots.")
+    ap.add_argument("old", help="previous snapshot (.txt dump or .csv)")
+    ap.add_argument("new", help="current snapshot (.txt dump or .csv)")
+    ap.add_argument("--out", default="delta", help="directory for the delta CSVs")
+    args = ap.parse_args(argv)
+
+    old = keyed(read_snapshot(args.old))
+    new = keyed(read_snapshot(args.new), previous=old)
+    added, removed, changed = diff(old, new)
+    write_delta(Path(args.out), old, new, added, removed, changed)
+
+    print(f"old rows: {len(old)} | new rows: {len(new)}")
+    print(f"added: {len(added)} | removed: {len(removed)} | changed: {len(changed)}")
+    by_field = defaultdict(int)
+    for _, fields in changed:
+        for field in fields:
+            by_field[field] += 1
+    for field in TRACKED_FIELDS:
+        print(f"  {field} changes: {by_field[field]}")
+    print(f"Delta saved to: {Path(args.out).resolve()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# faculty_registry.py — stable instructor ids across monthly snapshots
+#
+# faculty_id (normalize_degrees.clean_inputs) hashes the name, college,
+# degree and university of a listing, so it changes whenever any of those
+# is edited. The registry is a CSV that remembers every faculty_id it has
+# seen and the instructor_id it was given. An unseen faculty_id inherits
+# the id of the one instructor with the same case-folded name in the same
+# college, or failing that the one instructor with that name anywhere,
+# unless that instructor is still listed in the same snapshot (then the
+# listing is a namesake, not an edit) or another new listing takes the id
+# first; otherwise it starts a new instructor of its own. Ids are never
+# reused or renumbered.
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+COLUMNS = ["faculty_id", "instructor_id", "name_key", "college", "last_name", "first_name", "first_seen"]
+INT_COLUMNS = ["faculty_id", "instructor_id", "name_key"]
+
+
+def name_key(df):
+    """64-bit key of the case-folded (last_name, first_name) pair, as int64."""
+    names = pd.DataFrame({c: df[c].astype(object).str.casefold() for c in ["last_name", "first_name"]})
+    return pd.util.hash_pandas_object(names, index=False).astype("int64")
+
+
+class FacultyRegistry:
+    """faculty_id -> instructor_id table persisted as CSV."""
+
+    def __init__(self, path, table=None):
+        self.path = Path(path)
+        if table is None:
+            table = pd.DataFrame({c: pd.Series(dtype="int64" if c in INT_COLUMNS else object)
+                                  for c in COLUMNS})
+        self.table = table
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        table = pd.read_csv(path, dtype={c: "int64" if c in INT_COLUMNS else object for c in COLUMNS})
+        text = [c for c in COLUMNS if c not in INT_COLUMNS]
+        table[text] = table[text].where(table[text].notna(), None)
+        return cls(path, table)
+
+    def save(self, path=None):
+        path = Path(path or self.path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        self.table.to_csv(tmp, index=False)
+        tmp.replace(path)
+
+    def __len__(self):
+        return self.table["instructor_id"].nunique()
+
+    def _unique_match(self, new, keys, held):
+        # instructor_id where the registry has exactly one instructor for
+        # keys, not counting instructors in held (listed in this frame)
+        table = self.table[~self.table["instructor_id"].isin(held)]
+        cand = table.groupby(keys, dropna=False)["instructor_id"].agg(["nunique", "first"])
+        cand = cand.loc[cand["nunique"] == 1, "first"].rename("match")
+        return new[keys].join(cand, on=keys)["match"]
+
+    def assign(self, df, snapshot=None):
+        """
+        Return instructor_id (int64) for every row of a cleaned frame,
+        registering faculty_ids not seen before.
+        """
+        seen = df[["faculty_id", "last_name", "first_name", "college"]] \
+            .drop_duplicates("faculty_id").astype({"college": object})
+        new = seen[~seen["faculty_id"].isin(self.table["faculty_id"])].copy()
+
+        if len(new):
+            new["name_key"] = name_key(new).to_numpy()
+            # lowest faculty_id first within a name, whatever the row order
+            new = new.sort_values(["name_key", "college", "faculty_id"], na_position="last", kind="stable")
+            # instructors still listed in this frame are namesakes, not candidates
+            held = self.table.loc[self.table["faculty_id"].isin(seen["faculty_id"]), "instructor_id"]
+            match = self._unique_match(new, ["name_key", "college"], held) \
+                .fillna(self._unique_match(new, ["name_key"], held))
+            # an id goes to one new listing only
+            match[match.duplicated()] = float("nan")
+            fresh = match.isna()
+            start = int(self.table["instructor_id"].max()) + 1 if len(self.table) else 1
+            match[fresh] = range(start, start + int(fresh.sum()))
+            new["instructor_id"] = match.astype("int64")
+            new["first_seen"] = snapshot
+            new = new[COLUMNS].astype({c: "int64" for c in INT_COLUMNS})
+            if len(self.table):
+                new = pd.concat([self.table, new])
+            self.table = new.reset_index(drop=True)
+
+        ids = pd.Series(self.table["instructor_id"].to_numpy(), index=self.table["faculty_id"].to_numpy())
+        return df["faculty_id"].map(ids).astype("int64")
+
+
+def main(argv=None):
+    # quick look at a registry file: instructors, listings, listings per instructor
+    argv = sys.argv[1:] if argv is None else argv
+    reg = FacultyRegistry.load(argv[0] if argv else "faculty_registry.csv")
+    per = reg.table.groupby("instructor_id")["faculty_id"].size()
+    print(f"instructors: {len(reg)} | faculty_ids: {len(reg.table)} | "
+          f"instructors with edited listings: {int((per > 1).sum())}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,94 +3,162 @@
 Standalone script to build cleaned and aggregated datasets for instructor visuals.
 """
 
+import argparse
 import json
 import os
+import re
 from pathlib import Path
 import numpy as np
 import pandas as pd
 
+import degree_normalizer
+import faculty_registry
+import record_store
+import viz_writer
+from degree_normalizer import LEVELS, NORMALIZER
+from faculty_registry import FacultyRegistry
+from record_store import RecordStore
+from viz_writer import OutputWriter, input_hashes, read_manifest, up_to_date
+
 # === Paths ===
 BASE_DIR = Path("/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/instructor_directory")
 INPUT_FILE = BASE_DIR / "2025_06_instructors.csv"
 OUTPUT_DIR = BASE_DIR / "viz_data"
-
-# Degree mapping dictionary
-DEGREE_MAP = {
-    "Doctorate Degree": "PhD", "PhD": "PhD", "EdD": "EdD", "DBA": "DBA",
-    "DNP": "DNP", "JD": "JD", "MD": "MD", "EdS": "EdS",
-    "Master's Degree": "Master", "MA": "MA", "MS": "MS", "MBA": "MBA",
-    "MEd": "MEd", "MSEd": "MEd", "MPA": "MPA", "MPH": "MPH", "MSN": "MSN",
-    "MLIS": "MLIS", "MSIT": "MSIT", "MSCS": "MSCS",
-    "Bachelor's Degree": "Bachelor", "BA": "BA", "BS": "BS", "BSN": "BSN",
-    "Associate's Degree": "Associate", "AA": "AA", "AS": "AS"
-}
-
-DOCTORATE_TITLES = {"PHD", "EDD", "DBA", "DNP", "JD", "MD"}
-MASTER_TITLES = {"MASTER", "MA", "MS", "MBA", "MED", "MPA", "MPH", "MSN", "MLIS", "MSIT", "MSCS"}
-BACHELOR_TITLES = {"BACHELOR", "BA", "BS", "BSN"}
-ASSOCIATE_TITLES = {"ASSOCIATE", "AA", "AS"}
-
-
-def normalize_str(x):
-    if pd.isna(x):
-        return None
-    return " ".join(str(x).strip().split())
-
-
-def infer_degree_level(standard):
-    if not standard:
-        return "unknown"
-    u = standard.upper()
-    if u in DOCTORATE_TITLES:
-        return "doctorate"
-    if u in MASTER_TITLES:
-        return "master"
-    if u in BACHELOR_TITLES:
-        return "bachelor"
-    if u in ASSOCIATE_TITLES:
-        return "associate"
-    return "unknown"
+REGISTRY_FILE = BASE_DIR / "faculty_registry.csv"
+HISTORY_DIR = OUTPUT_DIR / "history"
+OUTPUT_FORMATS = ["csv"]  # any of "csv", "csv.gz", "parquet", "feather"
 
 
 def shannon_entropy(proportions):
-    p = proportions[proportions > 0]
-    return float(-(p * np.log(p)).sum()) if p.size else 0.0
+    # row-wise over the last axis; zero cells contribute nothing, empty rows give 0.0
+    p = np.asarray(proportions, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(p > 0, p * np.log(p), 0.0)
+    return np.where((p > 0).any(axis=-1), -terms.sum(axis=-1), 0.0)
+
+
+# Low-cardinality text columns (a few hundred distinct values at most) are
+# kept as Categoricals with sorted categories from load to the final
+# groupbys, so observed-only groupbys come out in the same order as before.
+CATEGORICAL_COLS = ["college", "degree", "degree_standard", "degree_level", "university"]
+
+
+def load_input(path):
+    # parse_instructors.py --store writes a columnar record store; anything
+    # else is read as the instructors CSV. Store columns come back as
+    # Categoricals; the name columns are widened to the object/None layout
+    # read_csv gives.
+    path = Path(path)
+    if path.suffix == ".rcs":
+        df = RecordStore.load(path).to_frame()
+        names = ["first_name", "last_name"]
+        df[names] = df[names].astype(object).where(df[names].notna(), None)
+        return df
+    return pd.read_csv(path, dtype={c: "category" for c in CATEGORICAL_COLS if c != "degree_standard"})
+
+
+def map_distinct(s, table_fn, categorical=False, missing=None):
+    """
+    Apply a lookup over the distinct values of s and broadcast it back.
+
+    table_fn gets the unique non-null values as an object Series and
+    returns one result per value; missing values come back as `missing`.
+    Categorical input reuses its codes instead of hashing every row.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+    else:
+        codes, uniques = pd.factorize(s)
+    table = np.append(table_fn(pd.Series(uniques, dtype=object)).to_numpy(dtype=object), missing)
+    if not categorical:
+        return pd.Series(table[codes], index=s.index, dtype=object)
+    # distinct inputs can share a result (" MS" and "MS"); re-code into sorted categories
+    table_codes, categories = pd.factorize(table, sort=True)
+    return pd.Series(pd.Categorical.from_codes(table_codes[codes], categories=categories),
+                     index=s.index)
+
+
+def normalize_col(s, categorical=False):
+    # per distinct value: strip and collapse whitespace runs, NaN -> None
+    return map_distinct(s, lambda u: u.astype(str).str.split().str.join(" "), categorical)
+
+
+def as_id_text(s):
+    # the str() text faculty_id hashes (None -> "None"), kept categorical so
+    # hash_pandas_object only hashes each distinct value once
+    return map_distinct(s, lambda u: u, categorical=True, missing="None")
 
 
 def clean_inputs(df):
     for col in ["first_name", "last_name", "college", "degree", "degree_level", "university"]:
-        df[col] = df[col].apply(normalize_str)
-
-    df["degree_standard"] = df["degree"].apply(
-        lambda s: DEGREE_MAP.get((s or "").strip(), normalize_str(s))
-    )
-
-    df["degree_level"] = df["degree_level"].str.lower()
-    df["degree_level"] = df.apply(
-        lambda r: r["degree_level"] if r["degree_level"] in {"doctorate", "master", "bachelor", "associate"}
-        else infer_degree_level(r["degree_standard"]),
-        axis=1
-    )
-
+        df[col] = normalize_col(df[col], categorical=col in CATEGORICAL_COLS)
+
+    # one normalizer lookup per distinct degree gives both title and level
+    df["degree_standard"] = map_distinct(df["degree"], lambda u: u.map(NORMALIZER.normalize).str[0],
+                                         categorical=True)
+    inferred = map_distinct(df["degree"], lambda u: u.map(NORMALIZER.normalize).str[1],
+                            missing="unknown")
+    level = df["degree_level"].str.lower()
+    df["degree_level"] = map_distinct(level.where(level.isin(LEVELS), inferred), lambda u: u,
+                                      categorical=True)
+
+    # int64 hash of the listing; kept numeric so dedupes and joins compare
+    # integers (the CSV text is the same as the old string ids)
+    id_cols = ["first_name", "last_name", "college", "degree", "university"]
     df["faculty_id"] = pd.util.hash_pandas_object(
-        df[["first_name", "last_name", "college", "degree", "university"]].astype(str),
+        pd.DataFrame({c: as_id_text(df[c]) for c in id_cols}),
         index=False
-    ).astype("int64").astype("string")
+    ).astype("int64")
 
     return df[["faculty_id", "first_name", "last_name", "college",
                "degree", "degree_standard", "degree_level", "university"]]
 
 
-def degree_level_by_college(df):
-    return df.groupby(["college", "degree_level"], as_index=False)["faculty_id"].nunique() \
-             .rename(columns={"faculty_id": "count"})
+CUBE_KEYS = ["college", "degree_standard", "degree_level", "university"]
+
+
+def cube_rows(df, keys=CUBE_KEYS):
+    # the distinct (cube keys, faculty_id) rows build_cube counts; these are
+    # what the chunked mode keeps between chunks
+    return df[keys + ["faculty_id"]].drop_duplicates()
+
+
+def build_cube(df):
+    """
+    Distinct faculty counts at college x degree_standard x degree_level x university.
+
+    faculty_id hashes college, degree and university, so an id sits in one
+    (college, degree_standard, university) cell and distinct counts add up
+    across those keys. Conflicting input rows can still give one id two
+    degree levels: `count` counts an id at every level it has, `faculty`
+    only at its first. Missing keys are kept as their own cells.
+    """
+    return cube_from_rows(cube_rows(df))
 
 
-def college_profile(df):
-    lvl = degree_level_by_college(df)
-    fac = df.groupby("college", as_index=False)["faculty_id"].nunique() \
-            .rename(columns={"faculty_id": "faculty_count"})
-    idx = lvl.groupby("college")["count"].idxmax()
+def cube_from_rows(ids, keys=CUBE_KEYS):
+    ids = ids.copy()
+    ids["faculty"] = ~ids.duplicated(["faculty_id"] + [k for k in keys if k != "degree_level"])
+    return ids.groupby(keys, observed=True, dropna=False, as_index=False) \
+              .agg(count=("faculty_id", "size"), faculty=("faculty", "sum"))
+
+
+def rollup(cube, keys):
+    # distinct faculty per keys; rows missing any of the keys drop out, as in a plain groupby
+    measure = "count" if "degree_level" in keys else "faculty"
+    return cube.dropna(subset=keys) \
+               .groupby(keys, observed=True, as_index=False)[measure].sum() \
+               .rename(columns={measure: "count"})
+
+
+def degree_level_by_college(cube):
+    return rollup(cube, ["college", "degree_level"])
+
+
+def college_profile(cube):
+    lvl = degree_level_by_college(cube)
+    fac = rollup(cube, ["college"]).rename(columns={"count": "faculty_count"})
+    idx = lvl.groupby("college", observed=True)["count"].idxmax()
     dom = lvl.loc[idx, ["college", "degree_level", "count"]] \
              .rename(columns={"degree_level": "dominant_level", "count": "dominant_count"})
     prof = fac.merge(dom, on="college", how="left")
@@ -98,60 +166,325 @@ def college_profile(df):
     return prof.drop(columns=["dominant_count"])
 
 
-def top_feeders(df):
-    return df.groupby("university", as_index=False)["faculty_id"].nunique() \
-             .rename(columns={"faculty_id": "count"}) \
-             .sort_values("count", ascending=False)
+def top_feeders(cube):
+    return rollup(cube, ["university"]).sort_values("count", ascending=False)
 
 
-def degree_titles_by_college_top(df, top_n=30):
-    t = df.groupby("degree_standard", as_index=False)["faculty_id"].nunique() \
-          .rename(columns={"faculty_id": "count"})
+def degree_titles_by_college_top(cube, top_n=30):
+    t = rollup(cube, ["degree_standard"])
     top_titles = set(t.sort_values("count", ascending=False).head(top_n)["degree_standard"])
-    return df[df["degree_standard"].isin(top_titles)] \
-        .groupby(["college", "degree_standard"], as_index=False)["faculty_id"].nunique() \
-        .rename(columns={"faculty_id": "count"})
-
-
-def college_diversity(df):
-    records = []
-    for college, sub in df.groupby("college"):
-        fac_count = sub["faculty_id"].nunique()
-        counts = sub.groupby("degree_standard")["faculty_id"].nunique().values.astype(float)
-        proportions = counts / counts.sum() if counts.sum() else np.array([])
-        entropy = shannon_entropy(proportions)
-        doc_count = sub[sub["degree_level"] == "doctorate"]["faculty_id"].nunique()
-        pct_doc = (doc_count / fac_count) if fac_count else 0.0
-        records.append({
-            "college": college,
-            "diversity_index": round(entropy, 4),
-            "faculty_count": fac_count,
-            "pct_doctorate": round(pct_doc, 4)
-        })
-    return pd.DataFrame.from_records(records)
-
-
-def rare_degrees(df):
-    c = df.groupby("degree_standard", as_index=False)["faculty_id"].nunique() \
-          .rename(columns={"faculty_id": "count"})
+    return rollup(cube[cube["degree_standard"].isin(top_titles)], ["college", "degree_standard"])
+
+
+def college_diversity(cube, key="college"):
+    """
+    Degree-title entropy and doctorate share per `key` group.
+
+    Works from a group x degree_standard count matrix, so any cube column
+    (college, university, a snapshot month) can be the key.
+    """
+    fac = rollup(cube, [key])
+    groups = pd.Index(fac[key])
+
+    by_title = rollup(cube, [key, "degree_standard"])
+    rows = groups.get_indexer(by_title[key])
+    cols, _ = pd.factorize(by_title["degree_standard"])
+    counts = np.zeros((len(groups), cols.max() + 1 if len(cols) else 0))
+    counts[rows, cols] = by_title["count"]
+
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        proportions = np.where(totals > 0, counts / totals, 0.0)
+    entropy = shannon_entropy(proportions)
+
+    lvl = rollup(cube, [key, "degree_level"])
+    doc = lvl[lvl["degree_level"] == "doctorate"]
+    doc_count = np.zeros(len(groups))
+    doc_count[groups.get_indexer(doc[key])] = doc["count"]
+    fac_count = fac["count"].to_numpy()
+    pct_doc = np.divide(doc_count, fac_count, out=np.zeros(len(groups)), where=fac_count > 0)
+
+    return pd.DataFrame({
+        key: fac[key].to_numpy(),
+        "diversity_index": pd.Series(entropy).round(4),
+        "faculty_count": fac_count,
+        "pct_doctorate": pd.Series(pct_doc).round(4)
+    })
+
+
+def rare_degrees(cube):
+    c = rollup(cube, ["degree_standard"])
     rare = c[c["count"] <= 3].copy()
     rare["rarity_bucket"] = np.where(rare["count"] == 1, "singleton", "low")
     return rare.sort_values(["rarity_bucket", "count", "degree_standard"])
 
 
-def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-    df = pd.read_csv(INPUT_FILE)
-    df_clean = clean_inputs(df)
-    df_clean.to_csv(OUTPUT_DIR / "cleaned_instructors.csv", index=False)
+def build_inputs(data, registry=None):
+    # everything the outputs are a function of: the data files ({name: path}),
+    # the faculty registry the instructor ids come from (if there is one yet),
+    # the normalizer table and the code that cleans, assigns ids and writes
+    paths = {**data, "degree_map": degree_normalizer.MAP_FILE}
+    if registry is not None and Path(registry).exists():
+        paths["faculty_registry"] = registry
+    for module in (degree_normalizer, faculty_registry, record_store, viz_writer):
+        paths[Path(module.__file__).name] = Path(module.__file__)
+    paths["normalize_degrees.py"] = Path(__file__)
+    return input_hashes(paths)
+
+
+# --- out-of-core mode ---
+#
+# The CSV is read CHUNK_ROWS rows at a time, twice. The first pass cleans
+# each chunk and keeps only mergeable partials: the distinct cube rows, the
+# first listing of every faculty_id (for the registry) and the categories
+# seen per column. Each chunk's partials are deduplicated on their own and
+# merged once at the end, so no chunk re-reads what came before. Those are
+# exact, so the aggregates match the in-memory path. The second pass cleans the chunks again and streams them into
+# cleaned_instructors with the final categories and instructor ids.
+
+CHUNK_ROWS = 500_000
+REGISTRY_FIELDS = ["faculty_id", "last_name", "first_name", "college"]
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    return pd.read_csv(path, chunksize=chunk_rows,
+                       dtype={c: "category" for c in CATEGORICAL_COLS if c != "degree_standard"})
+
+
+def union_categories(frames):
+    """Re-code Categorical columns of frames onto shared, sorted categories."""
+    frames = [f for f in frames if f is not None]
+    for col in frames[0].select_dtypes("category").columns:
+        cats = pd.Index(sorted(set().union(*(f[col].cat.categories for f in frames))), dtype=object)
+        for f in frames:
+            f[col] = f[col].cat.set_categories(cats)
+    return frames
+
+
+def merge_distinct(frames, subset=None):
+    # concat partials (first occurrence wins) and dedupe
+    return pd.concat(union_categories(frames), ignore_index=True).drop_duplicates(subset)
+
+
+def scan_chunks(path, chunk_rows=CHUNK_ROWS):
+    """First pass: return (distinct cube rows, registry listings, categories per column)."""
+    rows, listings = [], []
+    categories = {c: set() for c in CATEGORICAL_COLS}
+    for chunk in read_chunks(path, chunk_rows):
+        clean = clean_inputs(chunk)
+        rows.append(cube_rows(clean))
+        listings.append(clean[REGISTRY_FIELDS].drop_duplicates("faculty_id"))
+        for c in CATEGORICAL_COLS:
+            categories[c].update(clean[c].cat.categories)
+    return merge_distinct(rows), merge_distinct(listings, subset="faculty_id"), {c: pd.Index(sorted(v), dtype=object) for c, v in categories.items()}
+
+
+def cleaned_chunks(path, registry, categories, chunk_rows=CHUNK_ROWS):
+    """Second pass: cleaned chunks in the cleaned_instructors layout."""
+    for chunk in read_chunks(path, chunk_rows):
+        clean = clean_inputs(chunk)
+        for c, cats in categories.items():
+            clean[c] = clean[c].cat.set_categories(cats)
+        clean.insert(1, "instructor_id", registry.assign(clean))
+        yield clean
+
+
+# --- snapshot history ---
+#
+# Each monthly CSV (YYYY_MM_instructors.csv) is cleaned once and reduced to
+# a month x college x degree_standard x degree_level x university cube with
+# the same two measures as build_cube, so rollup() and college_diversity()
+# answer trend questions across months directly. The cube is written to
+# HISTORY_DIR; on the next run, months whose snapshot hash is unchanged are
+# taken from it instead of re-read.
+
+HISTORY_CUBE = "instructor_cube_by_month"
+month_rx = re.compile(r"(\d{4})_(\d{2})")
+
+
+def snapshot_month(path):
+    m = month_rx.search(Path(path).name)
+    if not m:
+        raise ValueError(f"cannot tell the month of {path} (expected YYYY_MM in the name)")
+    return f"{m.group(1)}-{m.group(2)}"
+
+
+def snapshot_paths(args):
+    """Snapshot files from files and/or directories, one per month, oldest first."""
+    paths = []
+    for a in map(Path, args):
+        paths.extend(sorted(a.glob("*_instructors.csv")) if a.is_dir() else [a])
+    by_month = {}
+    for p in paths:
+        month = snapshot_month(p)
+        if month in by_month:
+            raise ValueError(f"two snapshots for {month}: {by_month[month]} and {p}")
+        by_month[month] = p
+    return dict(sorted(by_month.items()))
+
+
+def month_cube(path, month):
+    clean = clean_inputs(load_input(path))
+    cube = build_cube(clean)
+    cube.insert(0, "month", month)
+    return cube
+
+
+def load_history_cube(out_dir, inputs):
+    """
+    Months of a previously written history cube that can be reused: same
+    code and degree map, same snapshot hash. Returns {month: cube rows}.
+    """
+    manifest = read_manifest(out_dir)
+    path = Path(out_dir) / f"{HISTORY_CUBE}.csv"
+    if not manifest or not path.exists():
+        return {}
+    old = manifest.get("inputs", {})
+    if any(old.get(k) != v for k, v in inputs.items() if not k.startswith("snapshot:")):
+        return {}
+    keep = {k.split(":", 1)[1] for k, v in inputs.items()
+            if k.startswith("snapshot:") and old.get(k) == v}
+    cube = pd.read_csv(path, dtype={"month": str, **{k: "category" for k in CUBE_KEYS}})
+    return {m: g.copy() for m, g in cube.groupby("month", sort=False) if m in keep}
+
+
+def build_history_cube(snapshots, reuse=None):
+    """Stack per-month cubes (reused or rebuilt) into one frame, oldest month first."""
+    reuse = reuse or {}
+    parts = [reuse[m] if m in reuse else month_cube(p, m) for m, p in snapshots.items()]
+    return pd.concat(union_categories(parts), ignore_index=True)
+
+
+def trend(history, keys=()):
+    """Distinct faculty per month (and keys), e.g. trend(h, ["university"])."""
+    return rollup(history, ["month"] + list(keys))
+
+
+def with_year_over_year(t, keys=()):
+    # count 12 months earlier for the same keys (NaN where that month is missing)
+    keys = list(keys)
+    prev = t[["month"] + keys + ["count"]].rename(columns={"count": "count_prev_year"})
+    prev["month"] = (pd.PeriodIndex(prev["month"], freq="M") + 12).astype(str)
+    out = t.merge(prev, on=["month"] + keys, how="left")
+    out["count_prev_year"] = out["count_prev_year"].astype("Int64")
+    out["yoy_change"] = out["count"] - out["count_prev_year"]
+    return out
+
+
+def feeder_trend(history, top_n=25):
+    """Monthly faculty per university for the top_n feeders of the latest month."""
+    t = trend(history, ["university"])
+    latest = t[t["month"] == t["month"].max()].nlargest(top_n, "count")["university"]
+    t = t[t["university"].isin(latest)]
+    t = t.assign(university=t["university"].astype(object)).sort_values(["university", "month"])
+    t["change"] = t.groupby("university")["count"].diff().astype("Int64")
+    return with_year_over_year(t, ["university"])
+
+
+def doctorate_share_trend(history, key="college"):
+    """pct_doctorate per month and key (key=None for the whole directory)."""
+    keys = [key] if key else []
+    fac = trend(history, keys).rename(columns={"count": "faculty_count"})
+    lvl = trend(history, keys + ["degree_level"])
+    doc = lvl[lvl["degree_level"] == "doctorate"].drop(columns="degree_level") \
+        .rename(columns={"count": "doctorate_count"})
+    out = fac.merge(doc, on=["month"] + keys, how="left").fillna({"doctorate_count": 0})
+    out["doctorate_count"] = out["doctorate_count"].astype("int64")
+    out["pct_doctorate"] = (out["doctorate_count"] / out["faculty_count"]).round(4)
+    return out
+
+
+def diversity_trend(history, key="college"):
+    """diversity_index and pct_doctorate per month and key (key=None for the whole directory)."""
+    if not key:
+        return college_diversity(history, key="month")
+    out = pd.concat([college_diversity(g, key).assign(month=m)
+                     for m, g in history.groupby("month", sort=True)], ignore_index=True)
+    return out[["month"] + [c for c in out.columns if c != "month"]]
+
+
+def run_history(args):
+    snapshots = snapshot_paths(args.snapshots)
+    inputs = build_inputs({f"snapshot:{m}": p for m, p in snapshots.items()})
+
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    if not args.force and up_to_date(HISTORY_DIR, inputs, OUTPUT_FORMATS):
+        print(f"Snapshots unchanged; outputs in {HISTORY_DIR.resolve()} are up to date.")
+        return
+
+    reuse = {} if args.force else load_history_cube(HISTORY_DIR, inputs)
+    history = build_history_cube(snapshots, reuse)
+    with OutputWriter(HISTORY_DIR, OUTPUT_FORMATS, inputs=inputs) as out:
+        out.submit(HISTORY_CUBE, history)
+        out.submit("faculty_by_month", trend(history))
+        out.submit("feeder_trend", feeder_trend(history))
+        out.submit("doctorate_share_by_month", doctorate_share_trend(history, key=None))
+        out.submit("doctorate_share_by_college_month", doctorate_share_trend(history))
+        out.submit("diversity_by_month", diversity_trend(history, key=None))
+        out.submit("diversity_by_college_month", diversity_trend(history))
+
+    print(f"{len(snapshots)} snapshots ({len(reuse)} reused), {len(history):,} cube rows. "
+          f"Outputs saved to: {HISTORY_DIR.resolve()}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip())
+    ap.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    ap.add_argument("--chunked", action="store_true",
+                    help="stream the CSV in chunks instead of loading it whole (same outputs)")
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    ap.add_argument("--snapshots", nargs="+", metavar="PATH",
+                    help="monthly *_instructors.csv files or directories: build the history cube "
+                         f"in {HISTORY_DIR.name}/ instead of the single-snapshot outputs")
+    args = ap.parse_args(argv)
+
+    if args.snapshots:
+        return run_history(args)
 
-    degree_level_by_college(df_clean).to_csv(OUTPUT_DIR / "degree_level_by_college.csv", index=False)
-    college_profile(df_clean).to_csv(OUTPUT_DIR / "college_profile.csv", index=False)
-    top_feeders(df_clean).to_csv(OUTPUT_DIR / "top_feeders.csv", index=False)
-    degree_titles_by_college_top(df_clean).to_csv(OUTPUT_DIR / "degree_titles_by_college_top30.csv", index=False)
-    college_diversity(df_clean).to_csv(OUTPUT_DIR / "college_diversity.csv", index=False)
-    rare_degrees(df_clean).to_csv(OUTPUT_DIR / "rare_degrees.csv", index=False)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    inputs = build_inputs({"instructors": INPUT_FILE}, REGISTRY_FILE)
+    if not args.force and up_to_date(OUTPUT_DIR, inputs, OUTPUT_FORMATS):
+        print(f"Inputs unchanged; outputs in {OUTPUT_DIR.resolve()} are up to date.")
+        return
+
+    registry = FacultyRegistry.load(REGISTRY_FILE)
+    snapshot = Path(INPUT_FILE).stem
+
+    if args.chunked:
+        rows, listings, categories = scan_chunks(INPUT_FILE, args.chunk_rows)
+        # registering the first listing of each id gives the same ids as the whole frame
+        registry.assign(listings, snapshot=snapshot)
+        registry.save()
+        cube = cube_from_rows(rows)
+    else:
+        df = load_input(INPUT_FILE)
+        df_clean = clean_inputs(df)
+
+        # instructor_id survives edits to a listing; faculty_id does not
+        df_clean.insert(1, "instructor_id", registry.assign(df_clean, snapshot=snapshot))
+        registry.save()
+
+    # the manifest records the registry as this run leaves it, so the next
+    # run is up to date unless someone edits the registry in between
+    inputs = build_inputs({"instructors": INPUT_FILE}, REGISTRY_FILE)
+
+    # frames are written in the background as soon as they exist; the
+    # cleaned rows are only read from here on
+    with OutputWriter(OUTPUT_DIR, OUTPUT_FORMATS, inputs=inputs) as out:
+        if args.chunked:
+            out.submit_chunks("cleaned_instructors",
+                              cleaned_chunks(INPUT_FILE, registry, categories, args.chunk_rows))
+        else:
+            out.submit("cleaned_instructors", df_clean)
+            # one pass over the cleaned rows; every output below rolls this up
+            cube = build_cube(df_clean)
+
+        out.submit("degree_level_by_college", degree_level_by_college(cube))
+        out.submit("college_profile", college_profile(cube))
+        out.submit("top_feeders", top_feeders(cube))
+        out.submit("degree_titles_by_college_top30", degree_titles_by_college_top(cube))
+        out.submit("college_diversity", college_diversity(cube))
+        out.submit("rare_degrees", rare_degrees(cube))
 
     print(f"Data processing complete. Outputs saved to: {OUTPUT_DIR.resolve()}")
 
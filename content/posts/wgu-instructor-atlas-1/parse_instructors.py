@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
 import re
 import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+from degree_normalizer import NORMALIZER
+from record_store import RecordStore
 
 infile = Path("instructor_data_raw.txt")
 
@@ -11,6 +21,9 @@ infile = Path("instructor_data_raw.txt")
 DEBUG = True
 EXPECTED_TOTAL = 1159
 SAMPLES_PER_SECTION = 3
+SHARD_BYTES = 8 * 1024 * 1024   # target shard size for parallel parsing
+DIAG_SAMPLES = 5                # diagnostics kept per event kind
+DIAG_BATCH = 1000               # diagnostics written per JSONL flush
 
 # anchors / headers
 copyright_anchor = "©"
@@ -24,29 +37,116 @@ catalog_headers = {
     "WGU Academy",
 }
 
-# degree hints (prefixes we’ll recognize even if comma is missing)
-DEGREE_PREFIXES = [
-    "PhD", "EdD", "DBA", "MBA", "MA", "MS", "M.S.", "MEd", "M.Ed.", "MLIS", "MPA",
-    "BS", "B.S.", "BA", "B.A.", "Doctorate Degree", "Master's Degree", "Bachelor's Degree",
-    "EdS", "MSEd", "MSCS", "MSIT", "MSN", "DNP", "JD", "MD"
-]
-deg_prefix_rx = re.compile(r"^(" + "|".join(map(re.escape, DEGREE_PREFIXES)) + r")\b")
+
+class Diagnostics:
+    """
+    Collects parser events ([FIX], [WARN], [NOTE], [INFO]) instead of
+    printing each one as it happens.
+
+    Every event is counted by kind and the first `sample_size` of each kind
+    are kept for the summary. With `jsonl_path`, events are also written to
+    that file `batch_size` at a time; the file is emptied first unless
+    `append` is set. `record_events` keeps them in memory so a worker can
+    hand them back to the parent. `echo` restores the old print-per-event
+    behaviour.
+    """
+
+    def __init__(self, sample_size=DIAG_SAMPLES, jsonl_path=None, batch_size=DIAG_BATCH,
+                 echo=False, record_events=False, append=False):
+        self.counts = Counter()
+        self.samples = defaultdict(list)
+        self.sample_size = sample_size
+        self.jsonl_path = jsonl_path
+        self.batch_size = batch_size
+        self.echo = echo
+        self.events = [] if (jsonl_path or record_events) else None
+        self.source = None
+        if jsonl_path and not append:
+            open(jsonl_path, "w", encoding="utf-8").close()
+
+    def emit(self, kind, lineno, message):
+        self.counts[kind] += 1
+        if len(self.samples[kind]) < self.sample_size:
+            self.samples[kind].append((lineno, message))
+        if self.echo:
+            print(f"[{kind}] L{lineno}: {message}")
+        if self.events is not None:
+            self.events.append({"source": self.source, "kind": kind,
+                                "lineno": lineno, "message": message})
+            if self.jsonl_path and len(self.events) >= self.batch_size:
+                self.flush()
+
+    def merge(self, other, line_offset=0):
+        # fold in a shard's diagnostics, its line numbers shifted by
+        # line_offset; call in shard order to stay deterministic
+        self.counts.update(other.counts)
+        for kind, rows in other.samples.items():
+            room = self.sample_size - len(self.samples[kind])
+            self.samples[kind].extend((lineno + line_offset, m) for lineno, m in rows[:max(room, 0)])
+        for e in other.events or ():
+            if line_offset:
+                e = {**e, "lineno": e["lineno"] + line_offset}
+            if self.echo:
+                print(f"[{e['kind']}] L{e['lineno']}: {e['message']}")
+            if self.events is not None:
+                self.events.append(e)
+        if self.jsonl_path and self.events and len(self.events) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.jsonl_path and self.events:
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(e) + "\n" for e in self.events))
+            self.events.clear()
+
+    def report(self):
+        print("\n== Diagnostics ==")
+        if not self.counts:
+            print("no events")
+        for kind in sorted(self.counts):
+            print(f"{kind}: {self.counts[kind]}")
+            for lineno, message in self.samples[kind]:
+                print(f"  L{lineno}: {message}")
+        if self.jsonl_path:
+            print(f"events written to: {self.jsonl_path}")
+
+# parser events go here; main() and shard workers swap in their own
+diagnostics = Diagnostics()
 
 name_comma_rx = re.compile(r'^\s*([^,]+),\s*(.+?)\s*$')
 
+# one-pass line classifier: the alternatives mirror the old check order
+# (footer, title, header, filler, instructor), and well-formed
+# "Last, First; Degree, University" rows come out already split.
+# Rows with a ';' that need tolerant parsing fall through to `row`.
+_college_headers = sorted(catalog_headers - {"Instructor Directory"}, key=len, reverse=True)
+LINE_RX = re.compile(
+    r"\s*(?:"
+    r"(?P<footer>" + re.escape(copyright_anchor) + r".*?Western Governors University.*?)"
+    r"|(?P<title>Instructor Directory)"
+    r"|(?P<header>" + "|".join(map(re.escape, _college_headers)) + r")"
+    r"|(?P<filler>\.+)"
+    r"|(?P<instructor>(?P<last>[^,;\s](?:[^,;]*[^,;\s])?)\s*,\s*(?P<first>[^;\s](?:[^;]*[^;\s])?)\s*;"
+    r"\s*(?P<degree>(?:[^,]*[^,\s])?)\s*,\s*(?P<university>(?:.*\S)?))"
+    r"|(?P<row>[^;]*;(?:.*\S)?)"
+    r"|(?P<other>\S(?:.*\S)?)"
+    r"|(?P<blank>)"
+    r")\s*"
+)
+
 def parse_name(name_part, lineno):
     # tolerate "Clark. Traci" -> "Clark, Traci"
     if ". " in name_part and "," not in name_part:
         fixed = name_part.replace(". ", ", ", 1)
         if DEBUG:
-            print(f"[FIX] L{lineno}: replaced '. ' with ', ' in name -> {fixed}")
+            diagnostics.emit("FIX", lineno, f"replaced '. ' with ', ' in name -> {fixed}")
         name_part = fixed
     m = name_comma_rx.match(name_part.strip())
     if m:
         last, firsts = m.groups()
         return last.strip(), firsts.strip(), None
     if DEBUG:
-        print(f"[WARN] L{lineno}: name not in 'Last, First' -> {name_part.strip()}")
+        diagnostics.emit("WARN", lineno, f"name not in 'Last, First' -> {name_part.strip()}")
     parts = name_part.strip().split()
     if len(parts) == 1:
         return parts[0], None, "single_token"
@@ -65,90 +165,115 @@ def split_right(right, lineno):
         degree, university = right.split(",", 1)
         return degree.strip(), university.strip(), None
 
-    m = deg_prefix_rx.match(right)
-    if m:
-        deg = m.group(1)
-        rest = right[m.end():].strip()
+    # degree titles we recognize even if the comma is missing, dotted or not
+    end = NORMALIZER.match_prefix(right)
+    if end:
+        deg = right[:end]
+        rest = right[end:].strip()
         if not rest:
             if DEBUG:
-                print(f"[WARN] L{lineno}: degree found but university missing -> {right}")
+                diagnostics.emit("WARN", lineno, f"degree found but university missing -> {right}")
         else:
             if DEBUG:
-                print(f"[FIX] L{lineno}: parsed degree without comma -> {deg} | {rest}")
+                diagnostics.emit("FIX", lineno, f"parsed degree without comma -> {deg} | {rest}")
         return deg, (rest or None), "missing_comma"
 
     if DEBUG:
-        print(f"[FIX] L{lineno}: no degree present, using university only -> {right}")
+        diagnostics.emit("FIX", lineno, f"no degree present, using university only -> {right}")
     return None, right, "no_degree"
 
-# counters
-counts = Counter(
-    total_lines=0,
-    title_lines=0,
-    college_header_lines=0,
-    footer_lines=0,
-    instructor_lines=0,
-    blank_lines=0,
-    other_lines=0,
-)
-
-by_college = Counter()
-sections = []                   # ordered list of detected colleges
-samples = defaultdict(list)     # college -> sample rows
-records = []                    # full parsed rows for downstream use
+LINE_TALLIES = {
+    "footer": "footer_lines",
+    "title": "title_lines",
+    "filler": "other_lines",
+    "blank": "blank_lines",
+}
 
-current_college = None
-saw_title = False
+def new_counts():
+    return Counter(
+        total_lines=0,
+        title_lines=0,
+        college_header_lines=0,
+        footer_lines=0,
+        instructor_lines=0,
+        blank_lines=0,
+        other_lines=0,
+    )
+
+def iter_records(path, counts=None, by_college=None, sections=None):
+    """
+    Yield parsed instructor rows one at a time, keeping memory flat.
 
-with infile.open("r", encoding="utf-8") as f:
-    for lineno, raw in enumerate(f, start=1):
-        line = raw.rstrip("\n")
+    Tallies are updated in place as lines are read; pass your own
+    counts / by_college Counters and sections list to inspect them
+    once the generator is exhausted.
+    """
+    diagnostics.source = str(path)
+    with Path(path).open("r", encoding="utf-8") as f:
+        yield from iter_lines(f, counts, by_college, sections)
+
+def iter_lines(lines, counts=None, by_college=None, sections=None, start=1):
+    """Same as iter_records, over any iterable of lines numbered from `start`."""
+    matches = zip(map(LINE_RX.fullmatch, lines), itertools.count(start))
+    return _records_from_matches(matches, counts, by_college, sections)
+
+def _records_from_matches(matches, counts=None, by_college=None, sections=None):
+    if counts is None:
+        counts = new_counts()
+    if by_college is None:
+        by_college = Counter()
+    if sections is None:
+        sections = []
+
+    current_college = None
+
+    for m, lineno in matches:
         counts["total_lines"] += 1
-        s = line.strip()
-
-        if not s:
-            counts["blank_lines"] += 1
-            continue
-
-        # robust footer skip: any line that starts with © and mentions WGU
-        if s.startswith(copyright_anchor) and "Western Governors University" in s:
-            counts["footer_lines"] += 1
+        kind = m.lastgroup
+
+        if kind == "instructor":
+            last, firsts, degree, university = m.group("last", "first", "degree", "university")
+            name_flag = right_flag = None
+
+        elif kind == "row":
+            # tolerant parse for rows the fast path could not split
+            row = m.group("row")
+            name_part, right = row.split(";", 1)
+            last, firsts, name_flag = parse_name(name_part, lineno)
+            degree, university, right_flag = split_right(right, lineno)
+
+        elif kind == "header":
+            counts["college_header_lines"] += 1
+            current_college = m.group("header")
+            sections.append(current_college)
             continue
 
-        # headers
-        if s in catalog_headers:
-            if s == "Instructor Directory":
-                counts["title_lines"] += 1
-                saw_title = True
-            else:
-                counts["college_header_lines"] += 1
-                current_college = s
-                sections.append(s)
-            continue
-
-        # ignore filler like "...."
-        if set(s) == {"."}:
-            counts["other_lines"] += 1
-            continue
-
-        # instructor row must have a ';'
-        if ";" not in s:
+        elif kind == "other":
             counts["other_lines"] += 1
             if DEBUG:
-                print(f"[INFO] L{lineno}: non-instructor line kept in totals -> {s}")
+                diagnostics.emit("INFO", lineno, f"non-instructor line kept in totals -> {m.group('other')}")
             continue
 
-        # parse
-        name_part, right = s.split(";", 1)
-        last, firsts, name_flag = parse_name(name_part, lineno)
-        degree, university, right_flag = split_right(right, lineno)
+        else:
+            # footer, title, filler ("....") and blank lines are only tallied
+            counts[LINE_TALLIES[kind]] += 1
+            continue
 
         if not current_college:
             # tolerate out-of-section instructor (shouldn't happen in this doc)
             current_college = "Unknown"
 
-        # store for downstream use
-        rec = {
+        counts["instructor_lines"] += 1
+        by_college[current_college] += 1
+
+        # granular debug notes
+        if DEBUG and (name_flag or right_flag):
+            nf = f"name={name_flag}" if name_flag else ""
+            rf = f"right={right_flag}" if right_flag else ""
+            tag = ", ".join(x for x in (nf, rf) if x)
+            diagnostics.emit("NOTE", lineno, f"tolerant parse -> {tag}")
+
+        yield {
             "college": current_college,
             "last_name": last,
             "first_names": firsts,
@@ -156,68 +281,233 @@ with infile.open("r", encoding="utf-8") as f:
             "university": university,
             "lineno": lineno,
         }
-        records.append(rec)
-
-        counts["instructor_lines"] += 1
-        by_college[current_college] += 1
 
-        # keep a few samples per section
-        if len(samples[current_college]) < SAMPLES_PER_SECTION:
-            samples[current_college].append({
-                "name": f"{last}" + (f", {firsts}" if firsts else ""),
-                "degree": degree or "(none)",
-                "university": university or "(none)",
-            })
+def find_shards(path, target_bytes=SHARD_BYTES):
+    """
+    Split a raw dump into (path, start, end) byte ranges.
 
-        # granular debug notes
-        if DEBUG and (name_flag or right_flag):
-            nf = f"name={name_flag}" if name_flag else ""
-            rf = f"right={right_flag}" if right_flag else ""
-            tag = ", ".join(x for x in (nf, rf) if x)
-            print(f"[NOTE] L{lineno}: tolerant parse -> {tag}")
-
-# ---------- OUTPUT (terminal) ----------
-
-# top: show title then each college with a few rows
-print("Instructor Directory\n")
-
-for sec in sections:
-    print(sec)
-    print("name | degree | university")
-    for r in samples[sec]:
-        print(f"{r['name']} | {r['degree']} | {r['university']}")
-    print()  # blank line between sections
-
-# summary and validation
-recon = (
-    counts["instructor_lines"]
-    + counts["title_lines"]
-    + counts["college_header_lines"]
-    + counts["footer_lines"]
-    + counts["blank_lines"]
-    + counts["other_lines"]
-)
+    Seeks to every target_bytes mark and reads forward only to the next
+    college-header line, where the cut lands, so every shard after the
+    first opens with its own header and parses exactly as it would
+    serially. Shards do not know their first line number; parse_snapshots
+    adds the lines of the shards before them.
+    """
+    header_bytes = {h.encode("utf-8") for h in catalog_headers if h != "Instructor Directory"}
+    size = os.path.getsize(path)
+    cuts = [0]
+    with open(path, "rb") as f:
+        mark = target_bytes
+        while mark < size:
+            f.seek(mark - 1)
+            f.readline()  # to the start of the first line after the mark
+            offset = f.tell()
+            for raw in iter(f.readline, b""):
+                if raw.strip() in header_bytes:
+                    cuts.append(offset)
+                    break
+                offset += len(raw)
+            mark = offset + target_bytes
+    cuts.append(size)
+    return [(str(path), a, b) for a, b in zip(cuts, cuts[1:])]
+
+def parse_shard(shard, record_events=False):
+    """Parse one (path, start, end) range; line numbers count from the range start."""
+    global diagnostics
+    path, start, end = shard
+    counts, by_college, sections = new_counts(), Counter(), []
+    # events stay with the shard and are replayed by the parent in shard
+    # order; the caller's sink is put back for in-process runs
+    outer, diagnostics = diagnostics, Diagnostics(record_events=record_events)
+    try:
+        # rows travel back to the parent as compact columns, not dicts
+        records = RecordStore()
+        with open(path, "rb") as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        diagnostics.source = str(path)
+        text = io.TextIOWrapper(io.BytesIO(chunk), encoding="utf-8")
+        records.extend(iter_lines(text, counts, by_college, sections))
+        return counts, by_college, sections, records, diagnostics
+    finally:
+        diagnostics = outer
+
+def parse_snapshots(paths, jobs=None, shard_bytes=SHARD_BYTES):
+    """
+    Parse many dumps across a process pool.
 
-print("== Parse Summary ==")
-print(f"Total input lines: {counts['total_lines']}")
-print(f"Title lines: {counts['title_lines']}")
-print(f"College header lines: {counts['college_header_lines']}")
-print(f"Footer lines (skipped): {counts['footer_lines']}")
-print(f"Instructor rows parsed: {counts['instructor_lines']}")
-print(f"Blank lines: {counts['blank_lines']}")
-print(f"Other lines: {counts['other_lines']}")
-
-print("\nParse validation:")
-print(f"expected total: {EXPECTED_TOTAL}")
-print(f"reconstructed sum: {recon}")
-status = "OK" if (counts["total_lines"] == EXPECTED_TOTAL == recon) else "MISMATCH"
-print(f"status: {status}")
-
-# additional tight check: sum of section counts equals parsed rows
-by_college_sum = sum(by_college.values())
-rows_ok = "OK" if by_college_sum == counts["instructor_lines"] else "MISMATCH"
-print(f"by_college sum: {by_college_sum}  vs parsed rows: {counts['instructor_lines']}  check: {rows_ok}")
-
-# exit non-zero if mismatched (useful in CI)
-if not (status == "OK" and rows_ok == "OK"):
-    sys.exit(1)
\ No newline at end of file
+    Yields (path, counts, by_college, sections, records) per file, in input
+    order, with records as a RecordStore. Shards are merged in file order,
+    so results match a serial run; worker diagnostics are merged into the
+    current `diagnostics` sink. With one worker or one shard, shards are
+    parsed in this process.
+    """
+    shards = [sh for p in paths for sh in find_shards(p, shard_bytes)]
+    record_events = diagnostics.echo or diagnostics.events is not None
+    work = partial(parse_shard, record_events=record_events)
+    workers = min(jobs or os.cpu_count() or 1, len(shards))
+    merged = {}
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext() as pool:
+        results = pool.map(work, shards) if pool else map(work, shards)
+        for (path, *_), result in zip(shards, results):
+            counts, by_college, sections, records, shard_diag = result
+            if path not in merged:
+                # shards arrive in order, so the previous file is complete
+                for done in merged.values():
+                    yield done
+                merged = {path: (path, new_counts(), Counter(), [], RecordStore())}
+            _, m_counts, m_by_college, m_sections, m_records = merged[path]
+            line_offset = m_counts["total_lines"]
+            diagnostics.merge(shard_diag, line_offset)
+            m_counts.update(counts)
+            m_by_college.update(by_college)
+            m_sections.extend(sections)
+            m_records.extend(records, line_offset)
+    for done in merged.values():
+        yield done
+
+def validate(counts, by_college, expected_total=None):
+    recon = (
+        counts["instructor_lines"]
+        + counts["title_lines"]
+        + counts["college_header_lines"]
+        + counts["footer_lines"]
+        + counts["blank_lines"]
+        + counts["other_lines"]
+    )
+    lines_ok = counts["total_lines"] == recon
+    if expected_total is not None:
+        lines_ok = lines_ok and counts["total_lines"] == expected_total
+    by_college_sum = sum(by_college.values())
+    status = "OK" if lines_ok else "MISMATCH"
+    rows_ok = "OK" if by_college_sum == counts["instructor_lines"] else "MISMATCH"
+    return recon, by_college_sum, status, rows_ok
+
+def add_sample(samples, rec):
+    # keep a few samples per section
+    college = rec["college"]
+    if len(samples[college]) < SAMPLES_PER_SECTION:
+        last, firsts = rec["last_name"], rec["first_names"]
+        samples[college].append({
+            "name": f"{last}" + (f", {firsts}" if firsts else ""),
+            "degree": rec["degree"] or "(none)",
+            "university": rec["university"] or "(none)",
+        })
+
+def report(counts, by_college, sections, samples, expected_total):
+    # ---------- OUTPUT (terminal) ----------
+
+    # top: show title then each college with a few rows
+    print("Instructor Directory\n")
+
+    for sec in sections:
+        print(sec)
+        print("name | degree | university")
+        for r in samples[sec]:
+            print(f"{r['name']} | {r['degree']} | {r['university']}")
+        print()  # blank line between sections
+
+    recon, by_college_sum, status, rows_ok = validate(counts, by_college, expected_total)
+
+    print("== Parse Summary ==")
+    print(f"Total input lines: {counts['total_lines']}")
+    print(f"Title lines: {counts['title_lines']}")
+    print(f"College header lines: {counts['college_header_lines']}")
+    print(f"Footer lines (skipped): {counts['footer_lines']}")
+    print(f"Instructor rows parsed: {counts['instructor_lines']}")
+    print(f"Blank lines: {counts['blank_lines']}")
+    print(f"Other lines: {counts['other_lines']}")
+
+    print("\nParse validation:")
+    print(f"expected total: {expected_total if expected_total is not None else '(not set)'}")
+    print(f"reconstructed sum: {recon}")
+    print(f"status: {status}")
+
+    # additional tight check: sum of section counts equals parsed rows
+    print(f"by_college sum: {by_college_sum}  vs parsed rows: {counts['instructor_lines']}  check: {rows_ok}")
+    return status == "OK" and rows_ok == "OK"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parse WGU instructor directory dumps.")
+    ap.add_argument("input", nargs="?", default=str(infile),
+                    help="raw dump, or a directory of *.txt dumps")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="worker processes for sharded parsing (0 = all cores)")
+    ap.add_argument("--shard-mb", type=float, default=SHARD_BYTES / 2**20,
+                    help="target shard size when splitting large dumps")
+    ap.add_argument("--expected-total", type=int, default=None,
+                    help=f"expected line count per dump (default {EXPECTED_TOTAL} for {infile})")
+    ap.add_argument("--echo", action="store_true",
+                    help="print every diagnostic as it happens (slow on messy dumps)")
+    ap.add_argument("--diag-jsonl", default=None,
+                    help="write all diagnostics to this JSONL file in batches (replaced each run)")
+    ap.add_argument("--diag-append", action="store_true",
+                    help="append to --diag-jsonl instead of replacing it")
+    ap.add_argument("--store", default=None,
+                    help="write parsed rows to this columnar record store file")
+    args = ap.parse_args(argv)
+
+    global diagnostics
+    diagnostics = Diagnostics(jsonl_path=args.diag_jsonl, echo=args.echo, append=args.diag_append)
+
+    path = Path(args.input)
+    jobs = args.jobs or os.cpu_count()
+    expected_total = args.expected_total
+    if expected_total is None and path == infile:
+        expected_total = EXPECTED_TOTAL
+
+    shard_bytes = int(args.shard_mb * 2**20)
+    # one core, or a dump that would be a single shard: workers only add
+    # process start-up and pickling
+    serial = jobs == 1 or os.cpu_count() == 1 or (path.is_file() and path.stat().st_size <= shard_bytes)
+    if path.is_file() and serial:
+        counts = new_counts()
+        by_college = Counter()
+        sections = []                   # ordered list of detected colleges
+        samples = defaultdict(list)     # college -> sample rows
+        store = RecordStore()
+        for rec in iter_records(path, counts, by_college, sections):
+            add_sample(samples, rec)
+            if args.store:
+                store.append(rec)
+        ok = report(counts, by_college, sections, samples, expected_total)
+    else:
+        paths = sorted(path.glob("*.txt")) if path.is_dir() else [path]
+        store = RecordStore()
+        ok = parse_parallel(paths, 1 if serial else jobs, shard_bytes,
+                            expected_total, store if args.store else None)
+
+    if args.store:
+        store.save(args.store)
+        print(f"\n{len(store)} rows saved to record store: {args.store}")
+
+    diagnostics.flush()
+    if DEBUG:
+        diagnostics.report()
+    # exit non-zero if mismatched (useful in CI)
+    return 0 if ok else 1
+
+def parse_parallel(paths, jobs, shard_bytes, expected_total, store=None):
+    if len(paths) == 1:
+        for _, counts, by_college, sections, records in parse_snapshots(paths, jobs, shard_bytes):
+            samples = defaultdict(list)
+            for rec in records:
+                add_sample(samples, rec)
+            if store is not None:
+                store.extend(records)
+        return report(counts, by_college, sections, samples, expected_total)
+
+    # directory of snapshots: one validation line per dump
+    all_ok = True
+    for p, counts, by_college, sections, records in parse_snapshots(paths, jobs, shard_bytes):
+        recon, by_college_sum, status, rows_ok = validate(counts, by_college, expected_total)
+        all_ok = all_ok and status == "OK" and rows_ok == "OK"
+        if store is not None:
+            store.extend(records)
+        print(f"{Path(p).name}: lines={counts['total_lines']} recon={recon} "
+              f"rows={counts['instructor_lines']} by_college={by_college_sum} "
+              f"status={status} rows_check={rows_ok}")
+    print(f"\n{len(paths)} dumps parsed with {jobs} workers: {'OK' if all_ok else 'MISMATCH'}")
+    return all_ok
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# record_store.py — compact columnar storage for parsed instructor rows
+#
+# The parsers used to keep every row as a 6-key dict. A RecordStore keeps
+# one dictionary-encoded column per text field (values list + int32 codes,
+# -1 for None) and an int64 array of line numbers, and hands out __slots__
+# Row views that read like the old dicts (row["college"]). It saves to a
+# small columnar file that normalize_degrees.py loads straight into
+# pandas Categoricals, with no CSV parsing.
+#
+# File layout: MAGIC, one JSON header line (row count, per-column values),
+# then each code/lineno array as little-endian bytes in header order.
+
+import json
+import sys
+from array import array
+from pathlib import Path
+
+MAGIC = b"RCS1\n"
+TEXT_FIELDS = ("college", "last_name", "first_names", "degree", "university")
+FIELDS = TEXT_FIELDS + ("lineno",)
+
+
+class Column:
+    """Dictionary-encoded text column; None is stored as code -1."""
+
+    __slots__ = ("values", "index", "codes")
+
+    def __init__(self, values=None, codes=None):
+        self.values = values if values is not None else []
+        self.index = {v: i for i, v in enumerate(self.values)}
+        self.codes = codes if codes is not None else array("i")
+
+    def code_for(self, value):
+        if value is None:
+            return -1
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.code_for(value))
+
+    def extend(self, other):
+        remap = [self.code_for(v) for v in other.values]
+        self.codes.extend(remap[c] if c >= 0 else -1 for c in other.codes)
+
+    def get(self, i):
+        c = self.codes[i]
+        return self.values[c] if c >= 0 else None
+
+    # the index is rebuilt on load rather than pickled across processes
+    def __getstate__(self):
+        return self.values, self.codes
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+class Row:
+    """Read-only view of one stored row; supports row.field and row["field"]."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store, i):
+        self._store = store
+        self._i = i
+
+    def __getitem__(self, field):
+        if field == "lineno":
+            return self._store.lineno[self._i]
+        return self._store.columns[field].get(self._i)
+
+    def __getattr__(self, field):
+        if field.startswith("_"):
+            raise AttributeError(field)
+        try:
+            return self[field]
+        except KeyError:
+            raise AttributeError(field) from None
+
+    def as_dict(self):
+        return {f: self[f] for f in FIELDS}
+
+    def __repr__(self):
+        return f"Row({self.as_dict()!r})"
+
+
+class RecordStore:
+    """Append-only columnar container for parser records."""
+
+    def __init__(self):
+        self.columns = {f: Column() for f in TEXT_FIELDS}
+        self.lineno = array("q")
+
+    def __len__(self):
+        return len(self.lineno)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return Row(self, i % len(self))
+
+    def __iter__(self):
+        return (Row(self, i) for i in range(len(self)))
+
+    def append(self, rec):
+        for f, col in self.columns.items():
+            col.append(rec[f])
+        self.lineno.append(rec["lineno"])
+
+    def extend(self, records, line_offset=0):
+        # line_offset shifts the line numbers of a shard's store
+        if isinstance(records, RecordStore):
+            for f, col in self.columns.items():
+                col.extend(records.columns[f])
+            if line_offset:
+                self.lineno.extend(n + line_offset for n in records.lineno)
+            else:
+                self.lineno.extend(records.lineno)
+        else:
+            for rec in records:
+                self.append(rec)
+
+    def save(self, path):
+        header = {
+            "rows": len(self),
+            "columns": {f: col.values for f, col in self.columns.items()},
+        }
+        with Path(path).open("wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+            for arr in [col.codes for col in self.columns.values()] + [self.lineno]:
+                if sys.byteorder != "little":
+                    arr = array(arr.typecode, arr)
+                    arr.byteswap()
+                arr.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with Path(path).open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a record store file")
+            header = json.loads(f.readline())
+            n = header["rows"]
+            for field in TEXT_FIELDS:
+                codes = array("i")
+                codes.fromfile(f, n)
+                store.columns[field] = Column(header["columns"][field], codes)
+            store.lineno.fromfile(f, n)
+        if sys.byteorder != "little":
+            for arr in [col.codes for col in store.columns.values()] + [store.lineno]:
+                arr.byteswap()
+        return store
+
+    def to_frame(self):
+        """
+        Columns in the instructors CSV layout, text fields as Categoricals.
+        """
+        import numpy as np
+        import pandas as pd
+
+        def cat(field):
+            col = self.columns[field]
+            codes = np.frombuffer(col.codes, dtype=np.int32)
+            return pd.Categorical.from_codes(codes, categories=pd.Index(col.values, dtype=object))
+
+        return pd.DataFrame({
+            "first_name": cat("first_names"),
+            "last_name": cat("last_name"),
+            "college": cat("college"),
+            "degree": cat("degree"),
+            "degree_level": pd.Series([None] * len(self), dtype=object),
+            "university": cat("university"),
+            "lineno": np.frombuffer(self.lineno, dtype=np.int64),
+        })
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# synth_directory.py — synthetic instructor directory dumps for benchmarks
+#
+# Writes text in the raw directory format: a title line, college headers,
+# "Last, First; Degree, University" rows and "© Western Governors
+# University ..." page footers, repeated as back-to-back monthly snapshots
+# until the requested line count is reached. Messy mode mixes in the
+# quirks parse_instructors.py tolerates. Names, degrees and universities
+# are drawn from the June 2025 CSV so value distributions look real.
+
+import argparse
+import csv
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+VOCAB_CSV = Path(__file__).with_name("2025_06_instructors.csv")
+SNAPSHOT_ROWS = 1134         # instructor rows per monthly snapshot
+PAGE_LINES = 62              # lines between page footers
+FIRST_PAGE = 313
+
+# share of rows given each quirk in messy mode
+QUIRKS = {
+    "missing_comma": 0.02,   # "Last, First; PhD Some University"
+    "dotted_name": 0.01,     # "Last. First; PhD, Some University"
+    "degree_only": 0.005,    # "Last, First; PhD"
+    "no_degree": 0.01,       # "Last, First; Some University"
+}
+
+
+def load_vocab(path=VOCAB_CSV):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    level_of = {}
+    for r in rows:
+        level_of.setdefault(r["degree"], r["degree_level"])
+
+    def weighted(field):
+        c = Counter(r[field] for r in rows if r[field])
+        return list(c), list(c.values())
+
+    return {
+        "first": sorted({r["first_name"] for r in rows if r["first_name"]}),
+        "last": sorted({r["last_name"] for r in rows if r["last_name"]}),
+        "college": weighted("college"),
+        "degree": weighted("degree"),
+        "university": weighted("university"),
+        "level_of": level_of,
+    }
+
+
+def snapshot_rows(rng, vocab, n=SNAPSHOT_ROWS):
+    """Return [(college, first, last, degree, university)] grouped by college."""
+    colleges, weights = vocab["college"]
+    per_college = Counter(rng.choices(colleges, weights, k=n))
+    degrees = rng.choices(*vocab["degree"], k=n)
+    universities = rng.choices(*vocab["university"], k=n)
+    rows = []
+    i = 0
+    for college in colleges:
+        names = sorted(zip(rng.choices(vocab["last"], k=per_college[college]),
+                           rng.choices(vocab["first"], k=per_college[college])))
+        for last, first in names:
+            rows.append((college, first, last, degrees[i], universities[i]))
+            i += 1
+    return rows
+
+
+def format_row(rng, first, last, degree, university, messy):
+    if messy:
+        r = rng.random()
+        for quirk, share in QUIRKS.items():
+            if r < share:
+                break
+            r -= share
+        else:
+            quirk = None
+        if quirk == "missing_comma":
+            return f"{last}, {first}; {degree} {university}"
+        if quirk == "dotted_name":
+            return f"{last}. {first}; {degree}, {university}"
+        if quirk == "degree_only":
+            return f"{last}, {first}; {degree}"
+        if quirk == "no_degree":
+            return f"{last}, {first}; {university}"
+    return f"{last}, {first}; {degree}, {university}"
+
+
+def generate(out_path, n_lines, seed=0, messy=True, csv_path=None, vocab=None):
+    """
+    Write exactly `n_lines` lines of synthetic directory text to out_path.
+
+    With csv_path, also write the clean fields of every instructor row in
+    the instructors CSV layout (input for normalize_degrees.clean_inputs).
+    Returns the number of instructor rows written.
+    """
+    rng = random.Random(seed)
+    vocab = vocab or load_vocab()
+    written = rows_out = 0
+    page = FIRST_PAGE
+    csv_file = open(csv_path, "w", newline="", encoding="utf-8") if csv_path else None
+    try:
+        writer = csv.writer(csv_file) if csv_file else None
+        if writer:
+            writer.writerow(["first_name", "last_name", "college", "degree", "degree_level", "university"])
+        with open(out_path, "w", encoding="utf-8") as out:
+            buf = []
+
+            def emit(line):
+                nonlocal written, page
+                buf.append(line)
+                written += 1
+                if written % PAGE_LINES == 0 and written < n_lines:
+                    buf.append(f"© Western Governors University May 22, 2025 {page}")
+                    written += 1
+                    page += 1
+
+            while written < n_lines:
+                emit("Instructor Directory")
+                college = None
+                for row in snapshot_rows(rng, vocab):
+                    if written >= n_lines:
+                        break
+                    if row[0] != college:
+                        college = row[0]
+                        emit(college)
+                        if written >= n_lines:
+                            break
+                    c, first, last, degree, university = row
+                    emit(format_row(rng, first, last, degree, university, messy))
+                    rows_out += 1
+                    if writer:
+                        writer.writerow([first, last, c, degree, vocab["level_of"].get(degree, ""), university])
+                out.write("\n".join(buf) + "\n")
+                buf.clear()
+    finally:
+        if csv_file:
+            csv_file.close()
+    return rows_out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write a synthetic instructor directory dump.")
+    ap.add_argument("out", help="output .txt path")
+    ap.add_argument("--lines", type=int, default=1159)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--clean", action="store_true", help="well-formed rows only (for base_parser.py)")
+    ap.add_argument("--csv", default=None, help="also write the rows as an instructors CSV")
+    args = ap.parse_args(argv)
+
+    rows = generate(args.out, args.lines, args.seed, not args.clean, args.csv)
+    print(f"Wrote {args.lines:,} lines ({rows:,} instructor rows) to {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
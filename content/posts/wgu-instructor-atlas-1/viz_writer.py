@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# viz_writer.py — write viz_data frames concurrently, in one or more formats
+#
+# normalize_degrees.py hands each output frame to an OutputWriter as soon
+# as it is built. Writes run on a thread pool, so the cleaned rows are
+# being written while the aggregates are still computed. A frame's CSV
+# text is rendered once and shared by the csv and csv.gz files; gzip and
+# Arrow (Parquet/Feather) writes release the GIL, so they overlap with
+# rendering. Closing the writer waits for every file and writes
+# manifest.json with row count, size and sha256 per file, so a site build
+# can check what it reads. The manifest also records the sha256 of the
+# inputs the frames were built from; up_to_date() compares those and the
+# files on disk so a rebuild with unchanged inputs can be skipped.
+#
+# Parquet and Feather need pyarrow; plain and gzipped CSV need nothing extra.
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+MANIFEST = "manifest.json"
+GZIP_LEVEL = 6  # zlib's default; level 9 is much slower for a few % smaller files
+
+
+def check_formats(formats):
+    # fail before anything is written, not halfway through the outputs
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        raise ValueError(f"unknown output format(s): {', '.join(unknown)} (choose from {', '.join(FORMATS)})")
+    if {"parquet", "feather"} & set(formats):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("parquet/feather output needs pyarrow (pip install pyarrow)") from None
+
+
+def render_csv(df, header=True):
+    return df.to_csv(index=False, header=header).encode("utf-8")
+
+
+def gzip_writer(raw):
+    # no file name and mtime=0 in the header keep the bytes, and so the
+    # checksum, stable across runs and the same however the data is fed in
+    return gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def write_frame(df, path, fmt, csv_bytes=None):
+    if fmt in ("csv", "csv.gz"):
+        data = csv_bytes if csv_bytes is not None else render_csv(df)
+        with open(path, "wb") as f:
+            if fmt == "csv.gz":
+                with gzip_writer(f) as gz:
+                    gz.write(data)
+            else:
+                f.write(data)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "feather":
+        df.reset_index(drop=True).to_feather(path)
+
+
+def arrow_schema(df):
+    """
+    Arrow schema of a chunked frame, from its first chunk. Object columns
+    are strings: a chunk where one is all null would otherwise infer type
+    null and no longer fit the file.
+    """
+    import pyarrow as pa
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for i, name in enumerate(df.columns):
+        if df[name].dtype == object:
+            schema = schema.set(i, pa.field(str(name), pa.string()))
+    return schema
+
+
+def write_chunks(chunks, paths):
+    """
+    Stream an iterable of frames into one file per format ({fmt: path}).
+
+    CSV output is byte-identical to writing the concatenated frame at once.
+    Parquet and Feather get one row group / record batch per chunk, so the
+    chunks have to share one schema (same dtypes and Categorical
+    categories), fixed by the first chunk (see arrow_schema). Returns
+    (rows, columns).
+    """
+    rows, columns = 0, None
+    csv_file = gz_file = gz = parquet = feather = schema = None
+    try:
+        for df in chunks:
+            first = columns is None
+            if first:
+                columns = list(map(str, df.columns))
+            if "csv" in paths or "csv.gz" in paths:
+                data = render_csv(df, header=first)
+                if first:
+                    csv_file = open(paths["csv"], "wb") if "csv" in paths else None
+                    if "csv.gz" in paths:
+                        gz_file = open(paths["csv.gz"], "wb")
+                        gz = gzip_writer(gz_file)
+                if csv_file:
+                    csv_file.write(data)
+                if gz:
+                    gz.write(data)
+            if "parquet" in paths or "feather" in paths:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                if first:
+                    schema = arrow_schema(df)
+                table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+                if first and "parquet" in paths:
+                    parquet = pq.ParquetWriter(paths["parquet"], schema)
+                if first and "feather" in paths:
+                    feather = pa.ipc.new_file(paths["feather"], schema,
+                                              options=pa.ipc.IpcWriteOptions(compression="lz4"))
+                if parquet:
+                    parquet.write_table(table)
+                if feather:
+                    feather.write_table(table)
+            rows += len(df)
+    finally:
+        if csv_file:
+            csv_file.close()
+        if gz:
+            gz.close()
+        if gz_file:
+            gz_file.close()
+        if parquet:
+            parquet.close()
+        if feather:
+            feather.close()
+    return rows, columns or []
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class OutputWriter:
+    """
+    Concurrent writer for named frames; use as a context manager.
+
+    A submitted frame must not be modified afterwards, since it is written
+    in the background.
+    """
+
+    def __init__(self, out_dir, formats=("csv",), max_workers=None, inputs=None):
+        check_formats(formats)
+        self.out_dir = Path(out_dir)
+        self.formats = list(formats)
+        self.inputs = inputs or {}
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2))
+        self.futures = []
+
+    def submit(self, name, df):
+        # rendering is queued ahead of the writes that wait on it
+        csv_text = None
+        if {"csv", "csv.gz"} & set(self.formats):
+            csv_text = self.pool.submit(render_csv, df)
+        for fmt in self.formats:
+            path = self.out_dir / f"{name}{FORMATS[fmt]}"
+            self.futures.append(self.pool.submit(self._write, name, df, path, fmt, csv_text))
+
+    def submit_chunks(self, name, chunks):
+        """
+        Write a frame that arrives as an iterable of chunks (out-of-core
+        mode). The chunks are consumed once, on a worker thread, for all
+        formats.
+        """
+        paths = {fmt: self.out_dir / f"{name}{FORMATS[fmt]}" for fmt in self.formats}
+        self.futures.append(self.pool.submit(self._write_chunks, name, chunks, paths))
+
+    @staticmethod
+    def _write_chunks(name, chunks, paths):
+        tmp = {fmt: p.with_name(p.name + ".tmp") for fmt, p in paths.items()}
+        try:
+            rows, columns = write_chunks(chunks, tmp)
+        except BaseException:
+            for p in tmp.values():
+                p.unlink(missing_ok=True)
+            raise
+        entries = []
+        for fmt, path in paths.items():
+            tmp[fmt].replace(path)
+            entries.append({
+                "name": name,
+                "file": path.name,
+                "format": fmt,
+                "rows": rows,
+                "columns": columns,
+                "bytes": path.stat().st_size,
+                "sha256": sha256_file(path),
+            })
+        return entries
+
+    @staticmethod
+    def _write(name, df, path, fmt, csv_text=None):
+        tmp = path.with_name(path.name + ".tmp")
+        csv_bytes = csv_text.result() if csv_text is not None and fmt in ("csv", "csv.gz") else None
+        write_frame(df, tmp, fmt, csv_bytes)
+        tmp.replace(path)
+        return {
+            "name": name,
+            "file": path.name,
+            "format": fmt,
+            "rows": len(df),
+            "columns": list(map(str, df.columns)),
+            "bytes": path.stat().st_size,
+            "sha256": sha256_file(path),
+        }
+
+    def close(self):
+        """Wait for all writes, write the manifest and return its entries."""
+        try:
+            entries = []
+            for f in self.futures:
+                result = f.result()
+                entries.extend(result if isinstance(result, list) else [result])
+        finally:
+            self.pool.shutdown()
+        entries.sort(key=lambda e: e["file"])
+        with open(self.out_dir / MANIFEST, "w", encoding="utf-8") as f:
+            json.dump({"inputs": self.inputs, "files": entries}, f, indent=2)
+            f.write("\n")
+        return entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.pool.shutdown(cancel_futures=True)
+        return False
+
+
+def input_hashes(paths):
+    """{name: sha256} for a {name: path} mapping of build inputs."""
+    return {name: sha256_file(path) for name, path in paths.items()}
+
+
+def read_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def up_to_date(out_dir, inputs, formats):
+    """
+    True if out_dir was built from exactly these input hashes in these
+    formats and every file still matches its recorded checksum.
+    """
+    manifest = read_manifest(out_dir)
+    if not manifest or manifest.get("inputs") != inputs or not manifest["files"]:
+        return False
+    if {e["format"] for e in manifest["files"]} != set(formats):
+        return False
+    return not verify(out_dir)
+
+
+def verify(out_dir):
+    """Return manifest entries whose file is missing or no longer matches."""
+    out_dir = Path(out_dir)
+    entries = read_manifest(out_dir)["files"]
+    bad = []
+    for e in entries:
+        path = out_dir / e["file"]
+        if not path.exists() or path.stat().st_size != e["bytes"] or sha256_file(path) != e["sha256"]:
+            bad.append(e)
+    return bad
+
+
+def main(argv=None):
+    # check a viz_data directory against its manifest
+    argv = sys.argv[1:] if argv is None else argv
+    out_dir = Path(argv[0] if argv else "viz_data")
+    bad = verify(out_dir)
+    for e in bad:
+        print(f"MISMATCH {e['file']}")
+    print(f"{'OK' if not bad else 'FAILED'}: {out_dir / MANIFEST}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# bubble_renderer.py — compact Leaflet bubble map, one data array
+#
+# folium wrote one L.circleMarker, one L.popup and one jQuery-built popup
+# element per university, each with its own style dict and random ids,
+# plus jQuery, Bootstrap and Font Awesome the map never used. Here all
+# points go into one columnar JSON array (coordinates rounded to 5
+# decimals, about a metre), radii are computed with NumPy, and a short
+# loop on the page draws them on a shared canvas renderer with one shared
+# style. A single click handler on the layer builds the popup on demand.
+# The page only loads Leaflet. Output is deterministic, so an unchanged
+# map is byte-identical.
+#
+#   python bubble_renderer.py university_counts_with_geo.csv university_bubble_map.html
+
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+LEAFLET = "https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet"
+TILES = "https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png"
+ATTRIBUTION = ('&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors '
+               '&copy; <a href="https://carto.com/attributions">CARTO</a>')
+STYLE = {"color": "#3388ff", "weight": 1, "fillOpacity": 0.6}
+
+# page head up to the open <script>, and the basemap layer once `m` exists;
+# shared with bubble_tiles.PAGE (format fields: title, leaflet, tiles, attribution)
+HEAD = """<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>\
+<meta name="viewport" content="width=device-width,initial-scale=1">\
+<link rel="stylesheet" href="{leaflet}.css"><script src="{leaflet}.js"></script>\
+<style>html,body,#map{{width:100%;height:100%;margin:0}}.leaflet-container{{font-size:1rem}}</style>\
+</head><body><div id="map"></div><script>"""
+BASEMAP = """L.tileLayer({tiles},{{attribution:{attribution},subdomains:"abcd",maxZoom:20}}).addTo(m);"""
+
+PAGE = HEAD + """\
+var D={data},m=L.map("map",{{center:D.center,zoom:4,worldCopyJump:true}}),\
+r=L.canvas(),g=L.featureGroup().addTo(m),s={style},i;""" + BASEMAP + """\
+for(i=0;i<D.n.length;i++)g.addLayer(L.circleMarker([D.lat[i],D.lng[i]],\
+Object.assign({{renderer:r,radius:D.r[i],i:i}},s)));\
+g.on("click",function(e){{var j=e.layer.options.i,p=document.createElement("div");\
+p.textContent=D.name[j]+" \\u2014 "+D.n[j]+" instructors";\
+L.popup().setLatLng(e.latlng).setContent(p).openOn(m)}});\
+if(D.n.length)m.fitBounds(D.bounds,{{padding:[20,20]}});\
+</script></body></html>
+"""
+
+
+def bubble_radius(counts):
+    """Marker radius in pixels, ~ sqrt(count), for a whole column at once."""
+    return 4 + 3 * np.sqrt(np.maximum(np.asarray(counts, dtype=float), 1))
+
+
+def js(value):
+    # compact JSON that cannot close the <script> element it sits in
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+
+
+def render_bubble_map(plot_df, out_path, title="WGU Instructor Alma Maters"):
+    """
+    Write the map for rows with university, count, lat and lng (no
+    missing coordinates); returns the number of bytes written.
+    """
+    lat = plot_df["lat"].to_numpy(dtype=float)
+    lng = plot_df["lng"].to_numpy(dtype=float)
+    count = plot_df["count"].to_numpy(dtype=int)
+    data = {
+        "lat": np.round(lat, 5).tolist(),
+        "lng": np.round(lng, 5).tolist(),
+        "r": np.round(bubble_radius(count), 2).tolist(),
+        "n": count.tolist(),
+        "name": plot_df["university"].astype(str).tolist(),
+        "center": [round(float(lat.mean()), 5), round(float(lng.mean()), 5)] if len(lat) else [39.8, -98.6],
+        "bounds": [[float(lat.min()), float(lng.min())], [float(lat.max()), float(lng.max())]] if len(lat) else None,
+    }
+    html = PAGE.format(title=title, leaflet=LEAFLET, data=js(data), style=js(STYLE),
+                       tiles=js(TILES), attribution=js(ATTRIBUTION))
+    raw = html.encode("utf-8")
+    with open(out_path, "wb") as f:
+        f.write(raw)
+    return len(raw)
+
+
+def main(argv=None):
+    # re-render a map from a joined counts CSV (university, count, lat, lng)
+    argv = sys.argv[1:] if argv is None else argv
+    src, out = argv if len(argv) == 2 else ("university_counts_with_geo.csv", "university_bubble_map.html")
+    df = pd.read_csv(src).dropna(subset=["lat", "lng"])
+    print(f"Wrote {out}: {len(df)} points, {render_bubble_map(df, out):,} bytes")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# bubble_tiles.py — per-zoom cluster tiles for a bubble map too big to inline
+#
+# bubble_renderer.py puts every point in the page, which is right for a
+# few hundred universities but not for every institution we track. Here
+# points are aggregated once per zoom level on a grid in Web Mercator
+# pixels: CELL_PX-pixel cells, so a 256-pixel map tile holds at most
+# (256 / CELL_PX)^2 bubbles. A cell's bubble sits at the count-weighted
+# centre of its universities and carries their summed count. Each zoom is
+# written as static files, one per non-empty map tile:
+#
+#   <out_dir>/<z>.json          ["x/y", ...] tiles that exist at zoom z
+#   <out_dir>/<z>/<x>/<y>.json  [[lat, lng, radius, count, universities, name], ...]
+#
+# The page fetches the tile list of the current zoom, then only the tiles
+# in view, as the map moves, so what the browser draws is bounded by the
+# viewport, not by the number of universities. Clustering stops at
+# MAX_ZOOM (cells ~10 km across), or earlier once every cell holds a
+# single location; the next level has every university as its own bubble,
+# sized as in the inline map, and closer zooms reuse it. That level is cut
+# into coarser POINT_TILE_ZOOM tiles, so it is not one file per few points.
+
+import hashlib
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bubble_renderer import ATTRIBUTION, BASEMAP, HEAD, LEAFLET, STYLE, TILES, bubble_radius, js
+
+TILE_PX = 256
+CELL_PX = 64
+MIN_ZOOM = 2
+MAX_ZOOM = 10
+POINT_TILE_ZOOM = 8
+MAX_RADIUS = CELL_PX / 2  # summed counts would otherwise swamp neighbouring cells
+
+PAGE = HEAD + """\
+var M={meta},B={base},m=L.map("map",{{center:M.center,zoom:4,worldCopyJump:true}}),\
+r=L.canvas(),s={style},G={{}},K={{}},T={{}},shown=null;""" + BASEMAP + """\
+function get(u){{return fetch(B+u).then(function(x){{return x.json()}})}}\
+function txy(lat,lng,z){{var n=1<<z,t=Math.sin(Math.max(-85.05,Math.min(85.05,lat))*Math.PI/180);\
+return[Math.max(0,Math.min(n-1,Math.floor((Math.max(-180,Math.min(179.999,lng))+180)/360*n))),\
+Math.max(0,Math.min(n-1,Math.floor((0.5-Math.log((1+t)/(1-t))/(4*Math.PI))*n)))]}}\
+function pop(e){{var d=e.layer.options.d,p=document.createElement("div");\
+p.textContent=d[4]>1?d[4]+" universities \\u2014 "+d[3]+" instructors (largest: "+d[5]+")":\
+d[5]+" \\u2014 "+d[3]+" instructors";L.popup().setLatLng(e.latlng).setContent(p).openOn(m)}}\
+function show(z){{var g=G[z]||(G[z]=L.featureGroup().on("click",pop)),tz=z===M.pointZoom?M.pointTileZoom:z;\
+if(shown!==g){{if(shown)m.removeLayer(shown);g.addTo(m);shown=g}}\
+if(!T[z]){{T[z]=get(z+".json").then(function(a){{var o={{}};a.forEach(function(k){{o[k]=1}});return o}})}}\
+T[z].then(function(have){{var b=m.getBounds(),a=txy(b.getNorth(),b.getWest(),tz),\
+c=txy(b.getSouth(),b.getEast(),tz),x,y,k;\
+for(x=a[0];x<=c[0];x++)for(y=a[1];y<=c[1];y++){{k=z+"/"+x+"/"+y;if(have[x+"/"+y]&&!K[k]){{K[k]=1;\
+get(k+".json").then(function(pts){{pts.forEach(function(d){{\
+g.addLayer(L.circleMarker([d[0],d[1]],Object.assign({{renderer:r,radius:d[2],d:d}},s)))}})}})}}}}}})}}\
+function update(){{show(Math.max(M.minZoom,Math.min(M.maxZoom,m.getZoom())))}}\
+m.on("moveend",update);if(M.bounds)m.fitBounds(M.bounds,{{padding:[20,20]}});update();\
+</script></body></html>
+"""
+
+
+def mercator_px(lat, lng, z):
+    """Global Web Mercator pixel coordinates at zoom z."""
+    scale = TILE_PX * 2.0 ** z
+    s = np.sin(np.radians(np.clip(lat, -85.05, 85.05)))
+    x = (np.clip(lng, -180, 179.999999) + 180) / 360 * scale
+    y = (0.5 - np.log((1 + s) / (1 - s)) / (4 * np.pi)) * scale
+    return x, y
+
+
+def cluster_zoom(df, z):
+    """One bubble per non-empty grid cell at zoom z, with its map tile."""
+    x, y = mercator_px(df["lat"].to_numpy(), df["lng"].to_numpy(), z)
+    cells = df.assign(cx=(x // CELL_PX).astype(np.int64), cy=(y // CELL_PX).astype(np.int64),
+                      wlat=df["lat"] * df["count"], wlng=df["lng"] * df["count"])
+    # rows are sorted largest first, so first() names the biggest university
+    out = cells.groupby(["cx", "cy"], sort=True).agg(
+        count=("count", "sum"), universities=("count", "size"),
+        wlat=("wlat", "sum"), wlng=("wlng", "sum"), name=("university", "first")).reset_index()
+    out["lat"] = out["wlat"] / out["count"]
+    out["lng"] = out["wlng"] / out["count"]
+    out["radius"] = np.minimum(bubble_radius(out["count"]), MAX_RADIUS)
+    per_tile = TILE_PX // CELL_PX
+    out["tx"] = out["cx"] // per_tile
+    out["ty"] = out["cy"] // per_tile
+    return out
+
+
+def point_cells(df, tile_zoom):
+    """Every university as its own bubble, cut into tiles of tile_zoom."""
+    x, y = mercator_px(df["lat"].to_numpy(), df["lng"].to_numpy(), tile_zoom)
+    out = df.assign(universities=1, name=df["university"], radius=bubble_radius(df["count"]),
+                    tx=(x // TILE_PX).astype(np.int64), ty=(y // TILE_PX).astype(np.int64))
+    return out.sort_values(["tx", "ty"], kind="stable")
+
+
+def write_tiles(plot_df, out_dir, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+    """
+    Write cluster tiles for rows with university, count, lat and lng into
+    out_dir (replaced as a whole). Returns the meta dict the page embeds.
+    """
+    out_dir = Path(out_dir)
+    tmp = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    df = plot_df[["university", "count", "lat", "lng"]].astype({"count": int, "lat": float, "lng": float})
+    df = df.sort_values(["count", "university"], ascending=[False, True], kind="stable")
+    locations = len(df[["lat", "lng"]].drop_duplicates())
+    digest = hashlib.sha256()
+    files = 0
+
+    def write_zoom(z, cells):
+        nonlocal files
+        keys = []
+        for (tx, ty), t in cells.groupby(["tx", "ty"], sort=True):
+            rows = [[round(a, 5), round(b, 5), round(r, 2), int(c), int(u), n] for a, b, r, c, u, n in
+                    zip(t["lat"], t["lng"], t["radius"], t["count"], t["universities"], t["name"])]
+            data = json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            path = tmp / str(z) / str(tx) / f"{ty}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            digest.update(f"{z}/{tx}/{ty}".encode() + data)
+            keys.append(f"{tx}/{ty}")
+            files += 1
+        (tmp / f"{z}.json").write_text(json.dumps(keys, separators=(",", ":")))
+
+    top, point_zoom, point_tile_zoom = min_zoom, None, None
+    for z in range(min_zoom, max_zoom + 1):
+        cells = cluster_zoom(df, z)
+        write_zoom(z, cells)
+        top = z
+        if len(cells) == locations:
+            break
+    else:
+        top = point_zoom = max_zoom + 1
+        point_tile_zoom = min(POINT_TILE_ZOOM, top)
+        write_zoom(top, point_cells(df, point_tile_zoom))
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp.rename(out_dir)
+    lat, lng = df["lat"], df["lng"]
+    # as in bubble_renderer: an empty map is centred on the US, with nothing to fit
+    center = [round(float(lat.mean()), 5), round(float(lng.mean()), 5)] if len(df) else [39.8, -98.6]
+    bounds = [[float(lat.min()), float(lng.min())], [float(lat.max()), float(lng.max())]] if len(df) else None
+    return {
+        "minZoom": min_zoom,
+        "maxZoom": top,
+        "pointZoom": point_zoom,
+        "pointTileZoom": point_tile_zoom,
+        "center": center,
+        "bounds": bounds,
+        "points": len(df),
+        "files": files,
+        "digest": digest.hexdigest(),
+    }
+
+
+def render_tiled_map(meta, out_path, tiles_url, title="WGU Instructor Alma Maters"):
+    """Write the page that lazy-loads tiles from tiles_url (relative to the page)."""
+    html = PAGE.format(title=title, leaflet=LEAFLET, meta=js(meta), base=js(tiles_url.rstrip("/") + "/"),
+                       style=js(STYLE), tiles=js(TILES), attribution=js(ATTRIBUTION))
+    raw = html.encode("utf-8")
+    with open(out_path, "wb") as f:
+        f.write(raw)
+    return len(raw)
+
+
+def main(argv=None):
+    # tile a joined counts CSV: bubble_tiles.py counts.csv map.html
+    argv = sys.argv[1:] if argv is None else argv
+    src, out = argv if len(argv) == 2 else ("university_counts_with_geo.csv", "university_bubble_map.html")
+    df = pd.read_csv(src).dropna(subset=["lat", "lng"])
+    tiles = Path(out).with_suffix("").name + "_tiles"
+    meta = write_tiles(df, Path(out).parent / tiles)
+    render_tiled_map(meta, out, tiles)
+    print(f"Wrote {out} + {meta['files']} tiles in {tiles}/ (zoom {meta['minZoom']}-{meta['maxZoom']})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,27 @@
 #!/usr/bin/env python3
-import json, time, pathlib, sys
+import argparse, asyncio, os, pathlib, sys
 import pandas as pd
-import requests
 import yaml
 
+import geocoder
+from gazetteer import SEED_CSV, MIN_CONFIDENCE, Gazetteer
+from geo_cache import GeoCache
+from uni_names import canonical_names
+
 CSV_PATH = "/WGU_catalog/instructor_directory/instructor_data/2025_06_instructors.csv"
 KEY_YAML = "/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/geomapping/config.yaml"
-OUT_JSON = "/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/geomapping/uni_geo_mapping.json"
+GEO_DB = "/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/geomapping/geo_cache.sqlite"
+OUT_JSON = "/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/geomapping/uni_geo_mapping.json"  # legacy; imported once
 UNMATCHED_TXT = "/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/geomapping/unmatched_universities.txt"
 OVERRIDES_CSV = "/Users/buddy/Desktop/WGU-Reddit/WGU_catalog/geomapping/uni_overrides.csv"
 
-GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
-FIND_PLACE_URL = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
-DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+# point at stub_geo_server.py for a dry run: GEO_BASE_URL=http://127.0.0.1:8765
+GEO_BASE_URL = os.environ.get("GEO_BASE_URL", geocoder.GOOGLE_BASE)
 
 def load_key(path):
     with open(path, "r") as f:
         return yaml.safe_load(f)["google_api_key"]
 
-def load_existing(path):
-    p = pathlib.Path(path)
-    if p.exists():
-        with open(p, "r") as f:
-            return json.load(f)
-    return {}
-
 def load_overrides(path):
     p = pathlib.Path(path)
     if not p.exists():
@@ -35,122 +32,100 @@ def load_overrides(path):
         df["geocode_query"].astype(str).str.strip()
     ))
 
-def geocode_via_geocoding(name, api_key):
-    params = {
-        "address": name,
-        "key": api_key,
-        "region": "us",
-        "components": "country:US"
-    }
-    r = requests.get(GEOCODE_URL, params=params, timeout=20)
-    if r.status_code != 200:
-        return None
-    data = r.json()
-    if data.get("status") != "OK" or not data.get("results"):
-        return None
-    res = data["results"][0]
-    loc = res["geometry"]["location"]
-    return {
-        "query": name,
-        "formatted_address": res.get("formatted_address"),
-        "place_id": res.get("place_id"),
-        "lat": loc["lat"],
-        "lng": loc["lng"],
-        "types": res.get("types", []),
-        "source": "geocoding"
-    }
-
-def geocode_via_places(name, api_key):
-    fp = requests.get(FIND_PLACE_URL, params={
-        "input": name,
-        "inputtype": "textquery",
-        "fields": "place_id,name,formatted_address,types",
-        "key": api_key
-    }, timeout=20).json()
-    cand = (fp.get("candidates") or [])
-    if not cand:
-        return None
-    pid = cand[0]["place_id"]
-    det = requests.get(DETAILS_URL, params={
-        "place_id": pid,
-        "fields": "name,formatted_address,geometry/location,types",
-        "key": api_key
-    }, timeout=20).json()
-    if det.get("status") != "OK" or "result" not in det:
-        return None
-    r = det["result"]
-    loc = r["geometry"]["location"]
-    return {
-        "query": name,
-        "formatted_address": r.get("formatted_address"),
-        "place_id": pid,
-        "lat": loc["lat"],
-        "lng": loc["lng"],
-        "types": r.get("types", []),
-        "source": "places"
-    }
-
-def geocode(name, api_key, retries=3, sleep_sec=0.25):
-    # try Geocoding first
-    for attempt in range(retries):
-        x = geocode_via_geocoding(name, api_key)
-        if x: return x
-        time.sleep(sleep_sec * (attempt + 1))
-    # fallback to Places
-    for attempt in range(retries):
-        x = geocode_via_places(name, api_key)
-        if x: return x
-        time.sleep(sleep_sec * (attempt + 1))
-    return None
-
-def main():
-    api_key = load_key(KEY_YAML)
+async def geocode_missing(to_do, query_for, cache, api_key, args):
+    """
+    Geocode to_do, storing each result (or definitive miss) in the cache as
+    it arrives. Unresolved lookups are not stored, so the next run retries them.
+    """
+    done = unresolved = 0
+    with geocoder.AsyncGeocoder(api_key, base_url=args.base_url, rate=args.rate,
+                                burst=args.burst, concurrency=args.concurrency, race=args.race) as engine:
+        async for uni, info in engine.geocode_all({u: query_for[u] for u in to_do}):
+            done += 1
+            if info is geocoder.UNRESOLVED:
+                unresolved += 1
+            else:
+                cache.put(uni, info, query=query_for[uni])
+            if done % 25 == 0:
+                print(f"{done}/{len(to_do)} lookups done")
+    print(f"{engine.requests_sent} API requests ({engine.retried} retries)")
+    if unresolved:
+        print(f"{unresolved} lookups got no answer (network, quota or key); not cached, retried next run")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Geocode instructor universities.")
+    ap.add_argument("--rate", type=float, default=geocoder.RATE_PER_SEC, help="requests per second (provider quota)")
+    ap.add_argument("--burst", type=float, default=None,
+                    help=f"requests allowed back to back (default: one second's rate, at most {geocoder.BURST})")
+    ap.add_argument("--concurrency", type=int, default=geocoder.CONCURRENCY, help="requests in flight")
+    ap.add_argument("--race", action="store_true", help="start the Places fallback alongside Geocoding")
+    ap.add_argument("--base-url", default=GEO_BASE_URL)
+    ap.add_argument("--export-json", action="store_true", help=f"also write {OUT_JSON}")
+    ap.add_argument("--gazetteer", action="append", default=[], metavar="CSV",
+                    help="extra institution list (name/university, lat, lng) for offline lookups")
+    ap.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE,
+                    help="lowest trigram similarity accepted from the gazetteer")
+    ap.add_argument("--offline", action="store_true", help="no API calls; gazetteer misses stay unmatched")
+    args = ap.parse_args(argv)
+
     overrides = load_overrides(OVERRIDES_CSV)
 
     df = pd.read_csv(CSV_PATH)
-    df["university"] = df["university"].astype(str).str.strip()
-
-    # known typo guard (seen earlier)
-    df.loc[df["university"].eq("versity of California, Santa Barbara"),
-           "university"] = "University of California, Santa Barbara"
+    raw = df["university"].dropna().astype(str).str.strip().loc[lambda s: s != ""]
 
-    universities = (
-        df["university"]
-        .dropna()
-        .loc[lambda s: s != ""]
-        .unique()
-        .tolist()
-    )
+    # one query per school: spelling variants and typos share one name
+    # (make_bubble_map.py groups counts the same way)
+    canon = canonical_names(raw)
+    universities = canon.unique().tolist()
+    print(f"{raw.nunique()} spellings -> {len(universities)} universities")
 
-    mapping = load_existing(OUT_JSON)
-    unmatched = []
+    cache = GeoCache(GEO_DB)
+    if not len(cache) and pathlib.Path(OUT_JSON).exists():
+        print(f"Imported {cache.import_json(OUT_JSON)} entries from {OUT_JSON}")
 
     # decide query string (override if present)
     query_for = {u: overrides.get(u, u) for u in universities}
 
-    to_do = [u for u in universities if u not in mapping]
-    print(f"Unique universities: {len(universities)} | remaining to geocode: {len(to_do)}")
-
-    for i, uni in enumerate(to_do, 1):
-        info = geocode(query_for[uni], api_key)
-        if info:
-            mapping[uni] = info
-        else:
-            unmatched.append(uni)
+    # gazetteer hits under the confidence now required are looked up again
+    weak = cache.forget_weak(args.min_confidence)
+    if weak:
+        print(f"Dropped {weak} gazetteer matches below confidence {args.min_confidence}")
 
-        if i % 25 == 0:
-            with open(OUT_JSON, "w") as f:
-                json.dump(mapping, f, indent=2)
-            print(f"Checkpoint saved at {i} lookups")
-        time.sleep(0.25)  # gentle pacing
-
-    with open(OUT_JSON, "w") as f:
-        json.dump(mapping, f, indent=2)
+    # new names, expired entries and names whose query changed
+    to_do = cache.stale(query_for)
+    print(f"Unique universities: {len(universities)} | remaining to geocode: {len(to_do)}")
 
+    # offline tier: known places need no API call
+    if to_do:
+        gaz = Gazetteer.from_csvs([SEED_CSV, *args.gazetteer])
+        misses, near = [], []
+        for uni in to_do:
+            info = gaz.geocode(uni, query_for[uni], args.min_confidence)
+            if info:
+                cache.put(uni, info, query=query_for[uni])
+                continue
+            misses.append(uni)
+            hit = gaz.nearest(query_for[uni])
+            if hit:
+                near.append(f"  {uni} ~ {hit[0]['name']} ({hit[1]})")
+        print(f"Gazetteer ({len(gaz)} places): {len(to_do) - len(misses)} found | {len(misses)} left")
+        if near:
+            print(f"{len(near)} fuzzy candidates below {args.min_confidence}, not used:", *near, sep="\n")
+        to_do = misses
+
+    if to_do and not args.offline:
+        api_key = load_key(KEY_YAML)
+        asyncio.run(geocode_missing(to_do, query_for, cache, api_key, args))
+
+    found = cache.lookup(universities)
+    unmatched = [u for u in universities if u not in found]
     with open(UNMATCHED_TXT, "w") as f:
         f.write("\n".join(unmatched))
+    if args.export_json:
+        cache.export_json(OUT_JSON)
+    cache.close()
 
-    print(f"Done. Saved {len(mapping)} entries to {OUT_JSON}")
+    print(f"Done. {len(found)} of {len(universities)} universities geocoded in {GEO_DB}")
     print(f"{len(unmatched)} unmatched saved to {UNMATCHED_TXT}")
 
 if __name__ == "__main__":
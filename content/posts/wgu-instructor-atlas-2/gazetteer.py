@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# gazetteer.py — offline lookup of university coordinates
+#
+# Sits between the geocode cache and the Google API in
+# build_uni_geo_mapping.py: a name the cache does not know is looked up
+# here first and only goes to the network if this misses. The index is
+# seeded from university_counts_with_geo.csv (shipped with this post) and
+# any other institution list with name/lat/lng columns, so a fresh
+# checkout can map almost every university without an API key.
+#
+# Lookups are by uni_names.canonical_key: an equal key is a match with
+# confidence 1.0. Otherwise entries are ranked by trigram Jaccard
+# similarity, which is reported as the confidence; the best one is a match
+# only if it reaches min_confidence. Anything lower goes to the network
+# ("Eastern University" scores 0.65 against "Southeastern University"),
+# and nearest() reports the best of those candidates so a threshold can be
+# tuned from real near misses. Typos in the directory are merged by
+# uni_names before names get here. Only the query's rarest trigrams are
+# probed in the inverted index (prefix filter), so a lookup touches a few
+# postings, not the list.
+#
+#   python gazetteer.py "Univ. of Texas at Austin" "Vanderbuilt University"
+
+import math
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from uni_names import canonical_key
+
+SEED_CSV = Path(__file__).with_name("university_counts_with_geo.csv")
+MIN_CONFIDENCE = 0.9  # "University of California" vs "... Davis" scores 0.81
+NEAR_BOUND = 0.6  # lowest similarity nearest() reports
+NAME_COLUMNS = ["university", "name", "institution"]
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """canonical key -> known location, with exact and trigram lookup."""
+
+    def __init__(self, rows=()):
+        self.entries = []        # dicts: name, lat, lng, formatted_address, place_id
+        self.by_key = {}         # canonical key -> entry index
+        self.grams = []          # trigram set per entry
+        self.postings = defaultdict(list)
+        for row in rows:
+            self.add(row)
+
+    @classmethod
+    def from_csvs(cls, paths=(SEED_CSV,)):
+        """Seed from CSVs with a name column (see NAME_COLUMNS) and lat/lng; first file wins."""
+        gaz = cls()
+        for path in paths:
+            df = pd.read_csv(path)
+            name_col = next(c for c in NAME_COLUMNS if c in df.columns)
+            df = df.dropna(subset=[name_col, "lat", "lng"])
+            for r in df.to_dict("records"):
+                gaz.add({
+                    "name": str(r[name_col]).strip(),
+                    "lat": float(r["lat"]),
+                    "lng": float(r["lng"]),
+                    "formatted_address": r.get("formatted_address") if pd.notna(r.get("formatted_address")) else None,
+                    "place_id": r.get("place_id") if pd.notna(r.get("place_id")) else None,
+                })
+        return gaz
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, row):
+        key = canonical_key(row["name"])
+        if not key or key in self.by_key:
+            return
+        i = len(self.entries)
+        self.entries.append(row)
+        self.by_key[key] = i
+        grams = trigrams(key)
+        self.grams.append(grams)
+        for g in grams:
+            self.postings[g].append(i)
+
+    def match(self, name, min_confidence=MIN_CONFIDENCE):
+        """(entry, confidence) of the best match for name reaching min_confidence, or None."""
+        return self.best(name, min_confidence)
+
+    def nearest(self, name):
+        """(entry, confidence) of the closest entry down to NEAR_BOUND, accepted or not."""
+        return self.best(name, NEAR_BOUND)
+
+    def best(self, name, bound):
+        key = canonical_key(name)
+        if not key:
+            return None
+        if key in self.by_key:
+            return self.entries[self.by_key[key]], 1.0
+        q = trigrams(key)
+        n = len(q)
+        # an entry with Jaccard >= t holds >= ceil(t * n) of the query's
+        # trigrams, so it holds one of any n - ceil(t * n) + 1 of them
+        probe = sorted(q, key=lambda g: (len(self.postings.get(g, ())), g))[:n - math.ceil(bound * n) + 1]
+        best = None
+        seen = set()
+        for g in probe:
+            for i in self.postings.get(g, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                m = len(self.grams[i])
+                if m < bound * n or n < bound * m:
+                    continue
+                inter = len(q & self.grams[i])
+                score = inter / (n + m - inter)
+                if score >= bound and (best is None or (score, -i) > (best[0], -best[1])):
+                    best = score, i
+        return (self.entries[best[1]], round(best[0], 3)) if best else None
+
+    def geocode(self, name, query=None, min_confidence=MIN_CONFIDENCE):
+        """
+        Result in the geocoder.py layout (source "gazetteer", plus the
+        confidence) for name, or for its override query; None on a miss.
+        """
+        hits = [h for h in (self.match(name, min_confidence),
+                            self.match(query, min_confidence) if query and query != name else None) if h]
+        if not hits:
+            return None
+        entry, confidence = max(hits, key=lambda h: h[1])
+        return {
+            "query": query or name,
+            "formatted_address": entry["formatted_address"],
+            "place_id": entry["place_id"],
+            "lat": entry["lat"],
+            "lng": entry["lng"],
+            "types": [],
+            "source": "gazetteer",
+            "confidence": confidence,
+            "matched_name": entry["name"],
+        }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    gaz = Gazetteer.from_csvs()
+    print(f"{len(gaz)} places from {SEED_CSV.name}")
+    for name in argv:
+        hit = gaz.match(name)
+        if hit:
+            entry, confidence = hit
+            print(f"{name} -> {entry['name']} ({entry['lat']:.4f}, {entry['lng']:.4f}) confidence {confidence}")
+        elif near := gaz.nearest(name):
+            print(f"{name} -> no match (nearest: {near[0]['name']}, confidence {near[1]})")
+        else:
+            print(f"{name} -> no match")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# geo_cache.py — SQLite store for geocoding results
+#
+# Replaces uni_geo_mapping.json as the place geocodes live. Each result is
+# one row upserted in its own transaction, so a crash loses at most the
+# lookup in flight and never corrupts what is already stored, and writing
+# one entry costs the same however big the cache is. Definitive misses are
+# stored too (matched = 0) so an unmatched name is not re-queried on every
+# run; lookups that failed without an answer are not stored at all.
+#
+# An entry needs a new lookup when it is older than its TTL (a year for
+# hits, a week for misses by default) or when the query it was looked up
+# with is no longer the query for that name (e.g. an override was added).
+# Gazetteer hits keep their confidence and the entry they matched, so a
+# fuzzy match can be audited, and forget_weak() drops those below a newly
+# required confidence (or stored before confidences were kept).
+# Readers like make_bubble_map.py open the file read-only (a missing
+# cache is an error, not a new empty one) and use lookup()/frame() for
+# the names they need, never the whole table.
+#
+#   python geo_cache.py geo_cache.sqlite                      # stats
+#   python geo_cache.py geo_cache.sqlite import uni_geo_mapping.json
+#   python geo_cache.py geo_cache.sqlite export uni_geo_mapping.json
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DAY = 86400
+TTL_DAYS = 365
+MISS_TTL_DAYS = 7
+
+INFO_FIELDS = ["query", "formatted_address", "place_id", "lat", "lng", "types", "source",
+               "confidence", "matched_name"]
+ADDED_COLUMNS = {"confidence": "REAL", "matched_name": "TEXT"}  # not in caches from before them
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocode (
+    university        TEXT PRIMARY KEY,
+    query             TEXT NOT NULL,
+    matched           INTEGER NOT NULL,
+    formatted_address TEXT,
+    place_id          TEXT,
+    lat               REAL,
+    lng               REAL,
+    types             TEXT,
+    source            TEXT,
+    fetched_at        REAL NOT NULL,
+    confidence        REAL,
+    matched_name      TEXT
+)
+"""
+COLUMNS = ["university", "query", "matched", "formatted_address", "place_id", "lat", "lng",
+           "types", "source", "fetched_at", "confidence", "matched_name"]
+UPSERT = f"INSERT OR REPLACE INTO geocode ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+class GeoCache:
+    """university -> geocode result, persisted in one SQLite file."""
+
+    def __init__(self, path, ttl_days=TTL_DAYS, miss_ttl_days=MISS_TTL_DAYS, read_only=False):
+        self.path = Path(path)
+        self.ttl = ttl_days * DAY
+        self.miss_ttl = miss_ttl_days * DAY
+        if read_only:
+            if not self.path.is_file():
+                raise FileNotFoundError(f"no geocode cache at {self.path}")
+            self.db = sqlite3.connect(self.path.resolve().as_uri() + "?mode=ro", uri=True)
+        else:
+            self.db = sqlite3.connect(self.path)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute(SCHEMA)
+        have = {r[1] for r in self.db.execute("PRAGMA table_info(geocode)")}
+        for col, kind in ADDED_COLUMNS.items():
+            if col not in have and not read_only:
+                self.db.execute(f"ALTER TABLE geocode ADD COLUMN {col} {kind}")
+                have.add(col)
+        self.db.commit()
+        self.fields = [f for f in INFO_FIELDS if f in have]  # an old read-only cache lacks ADDED_COLUMNS
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.db.execute("SELECT count(*) FROM geocode WHERE matched").fetchone()[0]
+
+    def _info(self, row):
+        # row: self.fields in order -> the dict geocoder.py / gazetteer.py produce
+        info = dict(zip(self.fields, row))
+        info["types"] = json.loads(info["types"]) if info["types"] else []
+        for col in ADDED_COLUMNS:
+            if info.get(col, 0) is None:
+                del info[col]  # network results have neither
+        return info
+
+    def get(self, university):
+        """Stored result for a matched university, else None."""
+        row = self.db.execute(
+            f"SELECT {', '.join(self.fields)} FROM geocode WHERE university = ? AND matched",
+            (university,)).fetchone()
+        return self._info(row) if row else None
+
+    def lookup(self, universities):
+        """{university: info} for the matched ones among universities."""
+        out = {}
+        names = list(universities)
+        for i in range(0, len(names), 500):  # stay under SQLite's variable limit
+            chunk = names[i:i + 500]
+            rows = self.db.execute(
+                f"SELECT university, {', '.join(self.fields)} FROM geocode "
+                f"WHERE matched AND university IN ({', '.join('?' * len(chunk))})", chunk)
+            out.update((r[0], self._info(r[1:])) for r in rows)
+        return out
+
+    def frame(self, columns=("university", "lat", "lng", "formatted_address"), universities=None):
+        """Matched entries (only those among universities, if given) as a DataFrame, in name order."""
+        sql = f"SELECT {', '.join(columns)} FROM geocode WHERE matched"
+        if universities is None:
+            return pd.read_sql_query(sql + " ORDER BY university", self.db)
+        names = list(universities)
+        parts = [pd.read_sql_query(f"{sql} AND university IN ({', '.join('?' * len(chunk))})",
+                                   self.db, params=chunk)
+                 for chunk in (names[i:i + 500] for i in range(0, len(names), 500))]
+        if not parts:
+            return pd.read_sql_query(sql + " AND 0", self.db)
+        return pd.concat(parts, ignore_index=True).sort_values("university", ignore_index=True)
+
+    def stale(self, query_for, now=None):
+        """
+        Names from {university: query} that need a lookup: not cached,
+        past their TTL, or cached under a different query.
+        """
+        now = time.time() if now is None else now
+        cached = {}
+        for u, q, matched, at in self.db.execute(
+                "SELECT university, query, matched, fetched_at FROM geocode"):
+            cached[u] = (q, matched, at)
+        todo = []
+        for u, q in query_for.items():
+            hit = cached.get(u)
+            if hit is None or hit[0] != q or now - hit[2] > (self.ttl if hit[1] else self.miss_ttl):
+                todo.append(u)
+        return todo
+
+    def forget_weak(self, min_confidence):
+        """Delete gazetteer hits with no confidence or one below min_confidence; returns how many."""
+        with self.db:
+            return self.db.execute(
+                "DELETE FROM geocode WHERE source = 'gazetteer' AND coalesce(confidence, 0) < ?",
+                (min_confidence,)).rowcount
+
+    def unmatched(self):
+        return [r[0] for r in self.db.execute(
+            "SELECT university FROM geocode WHERE NOT matched ORDER BY university")]
+
+    def put(self, university, info, query=None, now=None):
+        """Store one result (info None records a definitive miss for query); commits."""
+        now = time.time() if now is None else now
+        if info is None:
+            row = (university, query, 0, None, None, None, None, None, None, now, None, None)
+        else:
+            row = (university, info.get("query", query), 1, info.get("formatted_address"),
+                   info.get("place_id"), info.get("lat"), info.get("lng"),
+                   json.dumps(info.get("types") or []), info.get("source"), now,
+                   info.get("confidence"), info.get("matched_name"))
+        with self.db:
+            self.db.execute(UPSERT, row)
+
+    def import_json(self, path, now=None):
+        """
+        Load an old uni_geo_mapping.json (one transaction); returns entries
+        read. Its hits replace stored misses but never stored hits.
+        """
+        with open(path, "r") as f:
+            m = json.load(f)
+        now = os.path.getmtime(path) if now is None else now
+        with self.db:
+            for u, info in m.items():
+                self.db.execute(
+                    f"INSERT INTO geocode ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                    f"ON CONFLICT(university) DO UPDATE SET "
+                    f"{', '.join(f'{c} = excluded.{c}' for c in COLUMNS[1:])} WHERE NOT matched",
+                    (u, info.get("query", u), 1, info.get("formatted_address"), info.get("place_id"),
+                     info.get("lat"), info.get("lng"), json.dumps(info.get("types") or []),
+                     info.get("source"), now, info.get("confidence"), info.get("matched_name")))
+        return len(m)
+
+    def export_json(self, path):
+        """Write matched entries in the old uni_geo_mapping.json layout."""
+        rows = self.db.execute(
+            f"SELECT university, {', '.join(self.fields)} FROM geocode WHERE matched ORDER BY rowid")
+        m = {r[0]: self._info(r[1:]) for r in rows}
+        tmp = Path(str(path) + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(m, f, indent=2)
+        tmp.replace(path)
+        return len(m)
+
+    def digest(self):
+        """sha256 over the matched entries, for build-skip checks."""
+        h = hashlib.sha256()
+        for row in self.db.execute(
+                "SELECT university, lat, lng, formatted_address FROM geocode WHERE matched ORDER BY university"):
+            h.update(json.dumps(row).encode("utf-8"))
+        return h.hexdigest()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: geo_cache.py DB [import|export JSON]")
+        return 2
+    with GeoCache(argv[0]) as cache:
+        if len(argv) == 3 and argv[1] == "import":
+            print(f"read {cache.import_json(argv[2])} entries from {argv[2]}")
+        elif len(argv) == 3 and argv[1] == "export":
+            print(f"wrote {cache.export_json(argv[2])} entries to {argv[2]}")
+        print(f"{argv[0]}: {len(cache)} matched, {len(cache.unmatched())} unmatched")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# geocoder.py — concurrent geocoding engine for build_uni_geo_mapping.py
+#
+# Lookups run as asyncio tasks. A semaphore bounds how many requests are in
+# flight and a token bucket holds the request rate to the provider quota,
+# instead of a fixed sleep after every lookup. The bucket banks at most one
+# second of quota, so a strict per-second limit holds from the first batch.
+# The HTTP calls themselves are plain `requests` calls on one pooled
+# keep-alive session, run in a thread pool of `concurrency` workers (the
+# default executor has too few threads on a small machine), so the script
+# needs no extra dependency. Every
+# URL hangs off `base_url`, which can point at a local stub server
+# (stub_geo_server.py) for testing.
+#
+# Retries are per request and only for failures that can go away: network
+# errors, HTTP 429/5xx and the OVER_QUERY_LIMIT / UNKNOWN_ERROR statuses.
+# They back off exponentially with full jitter. ZERO_RESULTS and other
+# final answers are not retried; Geocoding misses go straight to Places.
+#
+# A lookup ends in a result, None for a definitive miss (ZERO_RESULTS /
+# NOT_FOUND, worth caching), or UNRESOLVED when no answer settles it:
+# retries ran out, or the request was refused (REQUEST_DENIED, a bad key,
+# an exhausted quota). Callers must not cache UNRESOLVED as a miss.
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GOOGLE_BASE = "https://maps.googleapis.com"
+GEOCODE_PATH = "/maps/api/geocode/json"
+FIND_PLACE_PATH = "/maps/api/place/findplacefromtext/json"
+DETAILS_PATH = "/maps/api/place/details/json"
+
+RATE_PER_SEC = 10       # provider quota, requests per second
+BURST = 10              # most tokens the bucket can hold; never more than one second's rate
+CONCURRENCY = 8         # requests in flight at once
+TIMEOUT = 20
+RETRIES = 4             # extra attempts after a transient failure
+BACKOFF_BASE = 0.5      # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+BACKOFF_CAP = 16.0
+
+# API statuses worth asking again; anything else (OK, ZERO_RESULTS,
+# NOT_FOUND, INVALID_REQUEST, REQUEST_DENIED) is the final answer
+TRANSIENT_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+# final answers that mean "no such place"; other non-OK ones are refusals
+MISS_STATUSES = {"ZERO_RESULTS", "NOT_FOUND"}
+
+
+class Unresolved:
+    """Outcome of a lookup that got no definitive answer; falsy like a miss."""
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return "UNRESOLVED"
+
+
+UNRESOLVED = Unresolved()
+
+
+def no_result(data):
+    """None if data is a definitive miss, UNRESOLVED otherwise."""
+    if data is not None and data.get("status") in MISS_STATUSES | {"OK"}:
+        return None
+    return UNRESOLVED
+
+
+def first_hit(*outcomes):
+    """The first result among outcomes; else UNRESOLVED if any was, else None."""
+    for x in outcomes:
+        if x:
+            return x
+    return UNRESOLVED if any(x is UNRESOLVED for x in outcomes) else None
+
+
+class TokenBucket:
+    """
+    asyncio token bucket: `rate` tokens per second, at most `capacity`
+    banked. acquire() waits until a token is free.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def pooled_session(pool_size):
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def backoff(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    # "full jitter": uniform over [0, base * 2**attempt], capped
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def parse_geocoding(data, name):
+    if data.get("status") != "OK" or not data.get("results"):
+        return None
+    res = data["results"][0]
+    loc = res["geometry"]["location"]
+    return {
+        "query": name,
+        "formatted_address": res.get("formatted_address"),
+        "place_id": res.get("place_id"),
+        "lat": loc["lat"],
+        "lng": loc["lng"],
+        "types": res.get("types", []),
+        "source": "geocoding"
+    }
+
+
+def parse_place_details(det, name, pid):
+    if det.get("status") != "OK" or "result" not in det:
+        return None
+    r = det["result"]
+    loc = r["geometry"]["location"]
+    return {
+        "query": name,
+        "formatted_address": r.get("formatted_address"),
+        "place_id": pid,
+        "lat": loc["lat"],
+        "lng": loc["lng"],
+        "types": r.get("types", []),
+        "source": "places"
+    }
+
+
+class AsyncGeocoder:
+    """
+    Geocoding API first, Places (find place + details) as the fallback.
+
+    With `race=True` the Places lookup starts alongside the Geocoding one
+    instead of after it fails; that saves a round trip per miss but spends
+    quota on names that geocode fine, so it is off by default.
+
+    Use as a context manager, or call close(), to release the connections.
+    """
+
+    def __init__(self, api_key, base_url=GOOGLE_BASE, rate=RATE_PER_SEC, burst=None,
+                 concurrency=CONCURRENCY, retries=RETRIES, backoff_base=BACKOFF_BASE, race=False):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        # a bucket holds at least one token, or it could never hand one out
+        self.bucket = TokenBucket(rate, max(1.0, min(BURST, rate)) if burst is None else burst)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.session = pooled_session(concurrency)
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="geocode")
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.race = race
+        self.requests_sent = 0
+        self.retried = 0
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def fetch(self, path, params):
+        """
+        Blocking GET (runs in a worker thread). Returns (data, transient):
+        data is the decoded JSON for a final answer, None otherwise.
+        """
+        try:
+            r = self.session.get(self.base_url + path,
+                                 params={**params, "key": self.api_key}, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            return None, True
+        except requests.RequestException:
+            return None, False
+        if r.status_code == 429 or r.status_code >= 500:
+            return None, True
+        if r.status_code != 200:
+            return None, False
+        try:
+            data = r.json()
+        except ValueError:
+            return None, True  # truncated body; worth another go
+        return data, data.get("status") in TRANSIENT_STATUSES
+
+    async def get_json(self, path, params):
+        """Rate-limited GET with retries; None when no final answer came back."""
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            async with self.slots:
+                self.requests_sent += 1
+                loop = asyncio.get_running_loop()
+                data, transient = await loop.run_in_executor(self.pool, self.fetch, path, params)
+            if not transient:
+                return data
+            if attempt < self.retries:
+                # waiting does not hold a request slot
+                self.retried += 1
+                await asyncio.sleep(backoff(attempt, self.backoff_base))
+        return None
+
+    async def via_geocoding(self, name):
+        data = await self.get_json(GEOCODE_PATH, {
+            "address": name,
+            "region": "us",
+            "components": "country:US"
+        })
+        return (parse_geocoding(data, name) if data else None) or no_result(data)
+
+    async def via_places(self, name):
+        fp = await self.get_json(FIND_PLACE_PATH, {
+            "input": name,
+            "inputtype": "textquery",
+            "fields": "place_id,name,formatted_address,types",
+        })
+        cand = (fp or {}).get("candidates") or []
+        if not cand:
+            return no_result(fp)
+        pid = cand[0]["place_id"]
+        det = await self.get_json(DETAILS_PATH, {
+            "place_id": pid,
+            "fields": "name,formatted_address,geometry/location,types",
+        })
+        return (parse_place_details(det, name, pid) if det else None) or no_result(det)
+
+    async def geocode(self, name):
+        """Result dict, None for a definitive miss, or UNRESOLVED."""
+        if not self.race:
+            x = await self.via_geocoding(name)
+            return x or first_hit(x, await self.via_places(name))
+        places = asyncio.create_task(self.via_places(name))
+        try:
+            x = await self.via_geocoding(name)
+            if x:
+                return x
+            return first_hit(x, await places)
+        finally:
+            places.cancel()
+
+    async def geocode_all(self, queries):
+        """
+        Geocode {key: query} concurrently; yields (key, outcome) in
+        completion order (see geocode()).
+        """
+        async def one(key, query):
+            return key, await self.geocode(query)
+
+        tasks = [asyncio.create_task(one(k, q)) for k, q in queries.items()]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for t in tasks:
+                t.cancel()
@@ -1,32 +1,72 @@
 #!/usr/bin/env python3
-# Requires: pandas>=2.0, folium>=0.16
+# Requires: pandas>=2.0, numpy
 
-import json, math
+import hashlib, json, os, shutil, sys
 import pandas as pd
-import folium
+
+from bubble_renderer import render_bubble_map
+from bubble_tiles import render_tiled_map, write_tiles
+from geo_cache import GeoCache
+from uni_names import canonical_names
 
 # Paths (adjust for your machine)
 CSV_PATH = "path/to/2025_06_instructors.csv"
-MAP_JSON = "path/to/uni_geo_mapping.json"
+GEO_DB = "path/to/geo_cache.sqlite"
 OUT_JOINED = "path/to/university_counts_with_geo.csv"
 OUT_BUBBLE = "path/to/university_bubble_map.html"
+OUT_TILES = os.path.splitext(OUT_BUBBLE)[0] + "_tiles"  # per-zoom cluster tiles for big maps
+BUILD_MANIFEST = OUT_BUBBLE + ".build.json"  # input/output hashes of the last run
+MAX_INLINE_POINTS = 2000  # above this (or with --tiles) the map lazy-loads OUT_TILES
 
-# 1) counts per university
-df = pd.read_csv(CSV_PATH)
-counts = df.groupby("university", dropna=True).size().reset_index(name="count")
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def sha256_tree(path):
+    # every file under path, by relative name; None if there is no such directory
+    if not os.path.isdir(path):
+        return None
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            p = os.path.join(root, name)
+            h.update(os.path.relpath(p, path).replace(os.sep, "/").encode() + b"\0" + sha256_file(p).encode())
+    return h.hexdigest()
 
-# 2) load geocode cache
-with open(MAP_JSON, "r") as f:
-    m = json.load(f)
+# 0) skip the rebuild if the inputs (and this script) hash the same as last
+#    time and the outputs, tile directory included, are still the files that
+#    run wrote; --force rebuilds
+cache = GeoCache(GEO_DB, read_only=True)  # a wrong path fails here instead of mapping nothing
+here = os.path.dirname(os.path.abspath(__file__))
+inputs = {name: sha256_file(p) for name, p in
+          [("instructors", CSV_PATH), ("make_bubble_map.py", __file__),
+           ("uni_names.py", os.path.join(here, "uni_names.py")),
+           ("bubble_renderer.py", os.path.join(here, "bubble_renderer.py")),
+           ("bubble_tiles.py", os.path.join(here, "bubble_tiles.py"))]}
+inputs["--tiles"] = "--tiles" in sys.argv[1:]
+inputs["geo_cache"] = cache.digest()  # entries, not the db file, which changes on every write
+outputs = [OUT_JOINED, OUT_BUBBLE]
+if "--force" not in sys.argv[1:] and os.path.exists(BUILD_MANIFEST):
+    with open(BUILD_MANIFEST, "r") as f:
+        last = json.load(f)
+    if last.get("inputs") == inputs and all(
+            os.path.exists(p) and sha256_file(p) == last["outputs"].get(p) for p in outputs) \
+            and sha256_tree(OUT_TILES) == last.get("tiles"):
+        print(f"Inputs unchanged; {OUT_BUBBLE} is up to date.")
+        sys.exit(0)
+
+# 1) counts per university, spelling variants merged as in build_uni_geo_mapping.py
+df = pd.read_csv(CSV_PATH)
+df["university"] = canonical_names(df["university"])
+counts = df.loc[df["university"].str.len() > 0].groupby("university").size().reset_index(name="count")
 
-geo = pd.DataFrame([
-    {"university": k,
-     "lat": v.get("lat"),
-     "lng": v.get("lng"),
-     # Keep place_id private in the published CSV
-     "formatted_address": v.get("formatted_address")}
-    for k, v in m.items()
-])
+# 2) geocodes for these universities (place_id stays private)
+geo = cache.frame(universities=counts["university"])
+cache.close()
 
 # 3) join and write a public-safe CSV
 joined = counts.merge(geo, on="university", how="left")
@@ -36,35 +76,19 @@ joined[pub_cols].to_csv(OUT_JOINED, index=False)
 # 4) filter mapped rows
 plot_df = joined.dropna(subset=["lat","lng"]).copy()
 
-# 5) map center and options
-center = [plot_df["lat"].mean(), plot_df["lng"].mean()]
-
-def bubble_radius(c):  # size ~ sqrt(count)
-    return 4 + 3 * math.sqrt(max(int(c), 1))
-
-mapp = folium.Map(
-    location=center, zoom_start=4, tiles="cartodbpositron",
-    world_copy_jump=True  # nicer panning
-)
-
-# 6) markers
-for _, r in plot_df.iterrows():
-    folium.CircleMarker(
-        location=[float(r["lat"]), float(r["lng"])],
-        radius=bubble_radius(r["count"]),
-        fill=True, fill_opacity=0.6, weight=1,
-        popup=f'{r["university"]} — {int(r["count"])} instructors'
-    ).add_to(mapp)
-
-# Optional: constrain panning to plotted points
-try:
-    bounds = [[plot_df["lat"].min(), plot_df["lng"].min()],
-              [plot_df["lat"].max(), plot_df["lng"].max()]]
-    mapp.fit_bounds(bounds, padding=(20, 20))
-except Exception:
-    pass
+# 5) one data array, canvas-rendered (bubble_renderer.py); past MAX_INLINE_POINTS,
+#    per-zoom cluster tiles the page loads for what is in view (bubble_tiles.py)
+if len(plot_df) > MAX_INLINE_POINTS or "--tiles" in sys.argv[1:]:
+    meta = write_tiles(plot_df, OUT_TILES)
+    render_tiled_map(meta, OUT_BUBBLE, os.path.basename(OUT_TILES))
+    print(f"Tiles: {meta['files']} files in {OUT_TILES} (zoom {meta['minZoom']}-{meta['maxZoom']})")
+else:
+    render_bubble_map(plot_df, OUT_BUBBLE)
+    shutil.rmtree(OUT_TILES, ignore_errors=True)  # left over from a tiled build
 
-mapp.save(OUT_BUBBLE)
+with open(BUILD_MANIFEST, "w") as f:
+    json.dump({"inputs": inputs, "outputs": {p: sha256_file(p) for p in outputs},
+               "tiles": sha256_tree(OUT_TILES)}, f, indent=2)
 
 print(f"Wrote: {OUT_BUBBLE}")
 print(f"Joined table: {OUT_JOINED}")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# stub_geo_server.py — local stand-in for the Google geocoding endpoints
+#
+# Serves the Geocoding, Find Place and Place Details paths geocoder.py
+# calls, with deterministic fake coordinates, so the engine can be run and
+# timed without an API key or quota. --latency adds a per-request delay,
+# --miss makes names containing that text fail Geocoding (so the Places
+# fallback is exercised), --absent makes them fail both (a definitive
+# miss), --fail-rate returns HTTP 500 and --limit-rate OVER_QUERY_LIMIT at
+# random. Connections are kept alive (HTTP/1.1) and
+# counted, so connection reuse can be checked.
+#
+#   python stub_geo_server.py --port 8765 --latency 0.2
+#   GEO_BASE_URL=http://127.0.0.1:8765 python build_uni_geo_mapping.py
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import geocoder
+
+
+def fake_location(name):
+    h = hashlib.sha256(name.encode("utf-8")).digest()
+    return {"lat": 25 + h[0] / 255 * 23, "lng": -124 + h[1] / 255 * 57}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    miss = None
+    absent = None
+    fail_rate = 0.0
+    limit_rate = 0.0
+    hits = None          # path -> request count; "connections" -> connections opened
+    hits_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.hits_lock:
+            self.hits["connections"] = self.hits.get("connections", 0) + 1
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with self.hits_lock:
+            self.hits[url.path] = self.hits.get(url.path, 0) + 1
+        time.sleep(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            return self.send_json({"status": "UNKNOWN_ERROR"}, status=500)
+        if self.limit_rate and random.random() < self.limit_rate:
+            return self.send_json({"status": "OVER_QUERY_LIMIT"})
+
+        if url.path == geocoder.GEOCODE_PATH:
+            name = q.get("address", "")
+            if any(m and m in name for m in (self.miss, self.absent)):
+                return self.send_json({"status": "ZERO_RESULTS", "results": []})
+            return self.send_json({"status": "OK", "results": [{
+                "formatted_address": f"{name}, USA",
+                "place_id": "geo-" + hashlib.md5(name.encode()).hexdigest()[:12],
+                "geometry": {"location": fake_location(name)},
+                "types": ["university"],
+            }]})
+        if url.path == geocoder.FIND_PLACE_PATH:
+            name = q.get("input", "")
+            if self.absent and self.absent in name:
+                return self.send_json({"status": "ZERO_RESULTS", "candidates": []})
+            return self.send_json({"status": "OK", "candidates": [
+                {"place_id": "place-" + name, "name": name}]})
+        if url.path == geocoder.DETAILS_PATH:
+            name = q.get("place_id", "").removeprefix("place-")
+            return self.send_json({"status": "OK", "result": {
+                "formatted_address": f"{name}, USA",
+                "geometry": {"location": fake_location(name)},
+                "types": ["university"],
+            }})
+        self.send_json({"status": "NOT_FOUND"}, status=404)
+
+
+def serve(port=0, latency=0.0, miss=None, fail_rate=0.0, limit_rate=0.0, absent=None):
+    """Start the stub in a daemon thread; returns (server, base_url)."""
+    handler = type("Handler", (StubHandler,), {
+        "latency": latency, "miss": miss, "absent": absent, "fail_rate": fail_rate,
+        "limit_rate": limit_rate, "hits": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve fake geocoding responses.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    ap.add_argument("--miss", default=None, help="names containing this fail Geocoding")
+    ap.add_argument("--absent", default=None, help="names containing this fail Geocoding and Places")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="share of requests answered with 500")
+    ap.add_argument("--limit-rate", type=float, default=0.0, help="share answered with OVER_QUERY_LIMIT")
+    args = ap.parse_args(argv)
+
+    server, url = serve(args.port, args.latency, args.miss, args.fail_rate, args.limit_rate, args.absent)
+    print(f"stub geocoder on {url} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# uni_names.py — group spelling variants of a university name
+#
+# The directory spells the same school several ways ("University of
+# California - Irvine" / "University of California, Irvine", "Missouri
+# St. Louis" / "Missouri - St Louis", the occasional clipped typo). Each
+# variant used to cost its own geocoding call and get its own bubble.
+#
+# Names are first reduced to a key: accents, case and punctuation dropped,
+# "&" -> "and", abbreviations spelled out ("Univ." -> "university",
+# "St." -> "saint"/"state"), filler words ("the", "at") and a "Main
+# Campus" suffix removed. Equal keys are one school.
+#
+# Remaining near-duplicates are merged only for typo-sized differences
+# (same_school): one word with a letter dropped, added or two letters
+# swapped after its first letter ("Libery", "Vanderbuilt", "Univeristy"),
+# or the same words reordered. Extra words ("University of California
+# Davis"), a prefix ("Eastern" / "Southeastern", "Emory" / "Memory"),
+# substituted letters ("Bowie" / "Boise") and spacing ("North Central" in
+# Minneapolis, "Northcentral" in Arizona) keep schools apart. So do two
+# one-edit keys that are both common: a typo is rare next to its original.
+# A blocking index keeps this from comparing every key with every other
+# one: keys are filed under signatures that any accepted pair shares, so
+# only keys in the same block are checked.
+#
+# Known bad spellings no rule can recover are fixed first, from ALIASES.
+# Every cluster is named after its most common spelling.
+#
+#   python uni_names.py instructors.csv     # print the merged clusters
+#   python uni_names.py --check             # run the SAME / DISTINCT cases
+
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+ABBREVIATIONS = {
+    "univ": "university",
+    "coll": "college",
+    "inst": "institute",
+    "mt": "mount",
+    "ft": "fort",
+}
+FILLER = {"the", "at"}
+FREQUENT_KEY = 3  # uses at which a one-edit spelling is a school of its own, not a typo
+
+# spellings in the directory too mangled for same_school, mapped by hand
+ALIASES = {
+    "versity of California, Santa Barbara": "University of California, Santa Barbara",
+}
+
+# regression cases for same_school() (after ALIASES): pairs it merges and pairs it must not
+SAME = [
+    ("University of California, Santa Barbara", "versity of California, Santa Barbara"),
+    ("Liberty University", "Libery University"),
+    ("Vanderbilt University", "Vanderbuilt University"),
+    ("William Howard Taft University", "William Howard Taft Univeristy"),
+    ("South Dakota State University", "South Dakota Sate University"),
+    ("University of California - Irvine", "University of California, Irvine"),
+]
+DISTINCT = [
+    ("Northeastern Illinois University", "Eastern Illinois University"),
+    ("Southeastern University", "Eastern University"),
+    ("Northwestern University", "Western University"),
+    ("Southwestern College", "Western College"),
+    ("Emory University", "Memory University"),
+    ("Bowie State University", "Boise State University"),
+    ("North Central University", "Northcentral University"),
+    ("University of California", "University of California, Davis"),
+]
+
+# only "Main Campus": other campus names are often schools of their own
+# ("University of Arizona Global Campus", "Colorado State University-Global Campus")
+campus_rx = re.compile(r"(?:\s*[,\-–(]\s*|\s+)main campus\)?\s*$")
+nonword_rx = re.compile(r"[^a-z0-9]+")
+
+
+def canonical_key(name):
+    """Matching key of a university name; "" for blank names."""
+    s = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    s = campus_rx.sub("", s.lower().replace("&", " and ").strip())
+    tokens = [t for t in nonword_rx.split(s.replace("'", "")) if t]
+    out = []
+    for i, t in enumerate(tokens):
+        if t == "st":
+            # "St. Cloud", "Missouri St. Louis" vs "Ohio St.", "Kansas St. University"
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+            t = "state" if nxt in (None, "university", "college") else "saint"
+        else:
+            t = ABBREVIATIONS.get(t, t)
+        if t in FILLER and out:
+            continue
+        if t == "the" and not out:
+            continue
+        out.append(t)
+    return " ".join(out)
+
+
+def variants(word):
+    """
+    Block labels for one word: the word and its one-letter deletions (two
+    words one drop, add or swap apart share one).
+    """
+    out = {word}
+    if len(word) >= 4:
+        out.update(word[:i] + word[i + 1:] for i in range(len(word)))
+    return out
+
+
+def candidate_pairs(keys):
+    """
+    Index pairs (i, j), i < j, of keys that share a block.
+
+    A key is filed under its word set (reorderings) and, per word position,
+    under the other words plus each variant of that word. Every pair
+    same_school() accepts shares at least one block.
+    """
+    blocks = defaultdict(list)
+    for i, key in enumerate(keys):
+        words = key.split()
+        blocks[("set",) + tuple(sorted(set(words)))].append(i)
+        for p, w in enumerate(words):
+            rest = (p,) + tuple(words[:p]) + ("*",) + tuple(words[p + 1:])
+            for v in variants(w):
+                blocks[rest + (v,)].append(i)
+    pairs = set()
+    for ids in blocks.values():
+        if len(ids) < 2:
+            continue
+        ids = sorted(set(ids))
+        pairs.update((a, b) for n, a in enumerate(ids) for b in ids[n + 1:])
+    return sorted(pairs)
+
+
+def one_edit(a, b):
+    """
+    True if b is a with one letter dropped, added, or two adjacent letters
+    swapped, the first letter left alone ("Emory" / "Memory" is two words).
+    """
+    if a[:1] != b[:1]:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) == 1:
+        i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), len(a))
+        return a[i:] == b[i + 1:]
+    if len(a) == len(b):
+        d = [i for i, (x, y) in enumerate(zip(a, b)) if x != y]
+        return len(d) == 2 and d[1] == d[0] + 1 and a[d[0]] == b[d[1]] and a[d[1]] == b[d[0]]
+    return False
+
+
+def same_school(a, b):
+    """Whether two keys differ only by a typo-sized change (see module notes)."""
+    ta, tb = a.split(), b.split()
+    if set(ta) == set(tb):
+        return True
+    if len(ta) != len(tb):
+        return False
+    diff = [i for i, (x, y) in enumerate(zip(ta, tb)) if x != y]
+    if len(diff) != 1:
+        return False
+    x, y = ta[diff[0]], tb[diff[0]]
+    if min(len(x), len(y)) < 4 or any(c.isdigit() for c in x + y):
+        return False
+    return one_edit(x, y)
+
+
+def cluster_keys(keys, counts=None):
+    """
+    Cluster id per key (union-find over verified candidate_pairs). With
+    counts (uses per key), two keys that both reach FREQUENT_KEY are only
+    merged if they hold the same words.
+    """
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidate_pairs(keys):
+        if not same_school(keys[i], keys[j]):
+            continue
+        if counts is not None and min(counts[i], counts[j]) >= FREQUENT_KEY \
+                and set(keys[i].split()) != set(keys[j].split()):
+            continue
+        parent[find(i)] = find(j)
+    return [find(i) for i in range(len(keys))]
+
+
+def canonical_names(names):
+    """
+    Map each name in a Series to its cluster's most common spelling.
+    Ties go to the spelling whose rarest word is used most across all
+    spellings (a typo or abbreviation makes a word rare), then to the
+    alphabetically first. Blank and missing names are left as is;
+    ALIASES are applied first.
+    """
+    s = pd.Series(names)
+    s = s.astype(object).where(s.isna(), s.astype(str).str.strip()).replace(ALIASES)
+    counts = s.dropna().astype(str).str.strip().loc[lambda x: x != ""].value_counts()
+    if counts.empty:
+        return s
+    spellings = pd.DataFrame({"name": counts.index, "n": counts.to_numpy()})
+    spellings["key"] = spellings["name"].map(canonical_key)
+    uses = spellings.groupby("key", sort=False)["n"].sum()
+    keys = uses.index.tolist()
+    cluster = dict(zip(keys, cluster_keys(keys, uses.tolist())))
+    spellings["cluster"] = spellings["key"].map(cluster)
+    words = spellings["name"].str.lower().str.findall(r"[a-z0-9]+")
+    used = Counter(w for ws in words for w in set(ws))
+    spellings["usual"] = [min((used[w] for w in ws), default=0) for ws in words]
+    best = spellings.sort_values(["cluster", "n", "usual", "name"], ascending=[True, False, False, True]) \
+        .drop_duplicates("cluster").set_index("cluster")["name"]
+    rename = dict(zip(spellings["name"], spellings["cluster"].map(best)))
+    return s.map(lambda x: rename.get(x, x))
+
+
+def check():
+    """Run the SAME / DISTINCT cases; returns the failures."""
+    def key(name):
+        return canonical_key(ALIASES.get(name, name))
+    bad = [(a, b) for a, b in SAME if not same_school(key(a), key(b))]
+    bad += [(a, b) for a, b in DISTINCT if same_school(key(a), key(b))]
+    for a, b in bad:
+        print(f"wrong: {a!r} / {b!r}")
+    return bad
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv == ["--check"]:
+        return 1 if check() else 0
+    df = pd.read_csv(argv[0] if argv else "2025_06_instructors.csv", usecols=["university"])
+    canon = canonical_names(df["university"])
+    merged = pd.DataFrame({"name": df["university"], "canonical": canon}).dropna() \
+        .drop_duplicates().loc[lambda d: d["name"].str.strip() != d["canonical"]]
+    for c, g in merged.groupby("canonical"):
+        print(f"{c} <- {' | '.join(sorted(g['name']))}")
+    print(f"{df['university'].nunique()} spellings -> {canon.nunique()} universities")
+
+
+if __name__ == "__main__":
+    sys.exit(main())